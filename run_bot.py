@@ -11,6 +11,6 @@ sys.path.insert(0, str(src_dir))
 
 # Now import and run the app directly
 if __name__ == "__main__":
-    import asyncio
-    from app import main
-    asyncio.run(main())
+    from app import run_main
+    
+    run_main()
@@ -2,6 +2,7 @@
 """Quick setup and test script for the arbitrage bot."""
 
 import sys
+import shutil
 import subprocess
 import asyncio
 from pathlib import Path
@@ -18,36 +19,57 @@ def install_dependencies():
         return False
 
 def run_tests():
-    """Run the test suite."""
+    """Run the test suite in-process."""
     print("\nRunning tests...")
     try:
-        subprocess.check_call([sys.executable, "-m", "pytest", "tests/", "-v"])
-        print("✓ Tests passed")
-        return True
-    except subprocess.CalledProcessError as e:
+        import pytest
+    except ImportError as e:
         print(f"✗ Tests failed: {e}")
         return False
+    
+    rc = pytest.main(["tests/", "-v"])
+    if rc == 0:
+        print("✓ Tests passed")
+        return True
+    print(f"✗ Tests failed: pytest exited with {rc}")
+    return False
 
 def check_types():
-    """Run type checking."""
+    """Run type checking in-process."""
     print("\nRunning type checks...")
     try:
-        subprocess.check_call([sys.executable, "-m", "mypy", "src/"])
-        print("✓ Type checking passed")
-        return True
-    except subprocess.CalledProcessError as e:
+        from mypy import api
+    except ImportError as e:
         print(f"✗ Type checking failed: {e}")
         return False
+    
+    stdout, stderr, rc = api.run(["src/"])
+    print(stdout, end="")
+    print(stderr, end="", file=sys.stderr)
+    if rc == 0:
+        print("✓ Type checking passed")
+        return True
+    print(f"✗ Type checking failed: mypy exited with {rc}")
+    return False
 
 def check_style():
     """Run style checks."""
     print("\nRunning style checks...")
     try:
-        subprocess.check_call([sys.executable, "-m", "ruff", "check", "src/"])
-        subprocess.check_call([sys.executable, "-m", "black", "--check", "src/"])
+        # ruff is a native binary; skip the Python wrapper when it is on PATH
+        ruff = shutil.which("ruff")
+        ruff_cmd = [ruff] if ruff else [sys.executable, "-m", "ruff"]
+        subprocess.check_call(ruff_cmd + ["check", "src/"])
+        
+        import black
+        rc = black.main(["--check", "src/"], standalone_mode=False)
+        if rc:
+            print(f"✗ Style checks failed: black exited with {rc}")
+            return False
+        
         print("✓ Style checks passed")
         return True
-    except subprocess.CalledProcessError as e:
+    except (subprocess.CalledProcessError, ImportError) as e:
         print(f"✗ Style checks failed: {e}")
         return False
 
@@ -2,70 +2,117 @@
 
 import asyncio
 import logging
-from typing import Dict, Set, Optional
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Optional
 from telegram import Bot
 from telegram.error import TelegramError
+from telegram.request import HTTPXRequest
+
+# Use xxHash for compact 64-bit dedupe keys when available
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
 
 from models import Opportunity, TriOpportunity
 from config import config
 
 logger = logging.getLogger(__name__)
 
+# Telegram caps a message at 4096 characters; leave headroom for the separators
+MAX_BATCH_CHARS = 3900
+BATCH_SEPARATOR = "\n\n---\n\n"
+
+# Memory bounds under opportunity storms
+MAX_QUEUED_ALERTS = 512
+MAX_DEDUPE_ENTRIES = 10_000
+
+# Under a deep backlog, widen the gap between sends so each batch carries more
+BURST_BACKLOG = 32
+BURST_SEND_INTERVAL = 3.0
+
+# Seconds stop() waits for pending alerts to be sent
+STOP_DRAIN_TIMEOUT = 5.0
+
+# Bloom prefilter slots (11-bit indices) in front of the dedupe table
+BLOOM_SLOTS = 2048
+BLOOM_MASK = BLOOM_SLOTS - 1
+
+# Log a progress line every this many sent batches
+SENT_LOG_INTERVAL = 1000
+
+def _dedupe_hash(dedupe_key: str) -> int:
+    """Reduce a dedupe key to a 64-bit integer.
+    
+    Collisions within the TTL window are astronomically unlikely and only
+    suppress a single alert.
+    """
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_intdigest(dedupe_key.encode())
+    return hash(dedupe_key)
+
 class AlertManager:
-    """Manages Telegram alerts with deduplication and throttling."""
+    """Manages Telegram alerts for one chat with deduplication and throttling."""
     
-    def __init__(self):
-        self.bot: Optional[Bot] = None
-        self.chat_id = config.TELEGRAM_CHAT_ID
-        self.enabled = False
-        
-        # Deduplication tracking
-        self.sent_alerts: Dict[str, datetime] = {}  # dedupe_key -> timestamp
-        self.alert_ttl = timedelta(seconds=30)  # TTL for deduplication
-        
-        # Rate limiting
-        self.last_send_time = datetime.utcnow()
-        self.min_send_interval = timedelta(seconds=1)  # Max 1 message per second
-        self.send_queue = asyncio.Queue()
+    def __init__(self, chat_id: str = "", bot: Optional[Bot] = None):
+        self.bot = bot
+        self.chat_id = chat_id
+        self.enabled = bot is not None and bool(chat_id)
+        
+        # Monotonic clock in float seconds; switched to the event loop's clock in start()
+        self._clock: Callable[[], float] = time.monotonic
+        
+        # Deduplication tracking (insertion order == expiry order since the TTL is fixed)
+        self.sent_alerts: "OrderedDict[int, float]" = OrderedDict()  # dedupe hash -> monotonic expiry
+        self.alert_ttl_seconds = 30.0  # TTL for deduplication
+        
+        # Two-generation Bloom filter over the TTL window; a miss proves the key is new
+        self._bloom = bytearray(BLOOM_SLOTS)
+        self._bloom_prev = bytearray(BLOOM_SLOTS)
+        self._bloom_rotated_at = self._clock()
+        
+        # Rate limiting (per chat, matching Telegram's per-chat limit)
+        self.last_send_time = self._clock()
+        self.min_send_interval = 1.0  # Max 1 message per second
+        self._pending: "deque[str]" = deque()  # Messages waiting to be sent
+        self._wake = asyncio.Event()  # Set when messages are pending
+        self._drained = asyncio.Event()  # Set when nothing is pending or in flight
+        self._drained.set()
         self.send_task: Optional[asyncio.Task] = None
-        
-        self._initialize_bot()
+        self._carry_over: Optional[str] = None  # Message that did not fit in the previous batch
+        self._sent_count = 0
+        self._retrying = False  # The next batch re-sends one that just failed
     
-    def _initialize_bot(self) -> None:
-        """Initialize Telegram bot if credentials are available."""
-        if not config.TELEGRAM_BOT_TOKEN or not config.TELEGRAM_CHAT_ID:
-            logger.warning("Telegram credentials not configured - alerts disabled")
+    def start(self) -> None:
+        """Start the send queue processor for this chat."""
+        if not self.enabled or self.send_task:
             return
         
-        try:
-            self.bot = Bot(token=config.TELEGRAM_BOT_TOKEN)
-            self.enabled = True
-            logger.info("Telegram bot initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize Telegram bot: {e}")
-            self.enabled = False
-    
-    async def start(self) -> None:
-        """Start the alert manager."""
-        if not self.enabled:
-            logger.info("Alert manager disabled - no Telegram credentials")
-            return
+        # Read time from the running loop; re-base the timestamps taken so far
+        self._clock = asyncio.get_running_loop().time
+        self.last_send_time = self._bloom_rotated_at = self._clock()
         
-        # Start the send queue processor
         self.send_task = asyncio.create_task(self._process_send_queue())
-        logger.info("Alert manager started")
+        logger.info("Alert manager started for chat %s", self.chat_id)
     
     async def stop(self) -> None:
-        """Stop the alert manager."""
+        """Stop the alert manager, flushing pending alerts first."""
         if self.send_task:
+            # Give queued alerts a bounded chance to go out before cancelling
+            try:
+                await asyncio.wait_for(self._drained.wait(), timeout=STOP_DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("Alert queue not drained on shutdown, dropping %d alerts", len(self._pending))
+            
             self.send_task.cancel()
             try:
                 await self.send_task
             except asyncio.CancelledError:
                 pass
         
-        logger.info("Alert manager stopped")
+        logger.info("Alert manager stopped for chat %s", self.chat_id)
     
     async def send_cross_exchange_alert(self, opportunity: Opportunity) -> bool:
         """Send cross-exchange arbitrage alert.
@@ -74,23 +121,20 @@ class AlertManager:
             opportunity: Cross-exchange opportunity
             
         Returns:
-            True if alert was sent (or queued), False if deduplicated
+            True if alert was queued, False if deduplicated or dropped
         """
         if not self.enabled:
             return False
         
-        # Check deduplication
-        if self._is_duplicate(opportunity.dedupe_key):
+        # Check deduplication and mark as sent in a single probe
+        key = _dedupe_hash(opportunity.dedupe_key)
+        if self._check_and_mark(key, self._clock()):
             return False
         
-        # Format alert message
-        message = self._format_cross_exchange_message(opportunity)
-        
-        # Queue the message
-        await self.send_queue.put(message)
-        
-        # Mark as sent for deduplication
-        self._mark_sent(opportunity.dedupe_key)
+        # Queue the pre-rendered message, dropping it if the queue is full
+        if not self._enqueue(opportunity.alert_text):
+            self.sent_alerts.pop(key, None)
+            return False
         
         return True
     
@@ -101,141 +145,212 @@ class AlertManager:
             opportunity: Triangular opportunity
             
         Returns:
-            True if alert was sent (or queued), False if deduplicated
+            True if alert was queued, False if deduplicated or dropped
         """
         if not self.enabled:
             return False
         
-        # Check deduplication
-        if self._is_duplicate(opportunity.dedupe_key):
+        # Check deduplication and mark as sent in a single probe
+        key = _dedupe_hash(opportunity.dedupe_key)
+        if self._check_and_mark(key, self._clock()):
             return False
         
-        # Format alert message
-        message = self._format_triangular_message(opportunity)
-        
-        # Queue the message
-        await self.send_queue.put(message)
-        
-        # Mark as sent for deduplication
-        self._mark_sent(opportunity.dedupe_key)
+        # Queue the pre-rendered message, dropping it if the queue is full
+        if not self._enqueue(opportunity.alert_text):
+            self.sent_alerts.pop(key, None)
+            return False
         
         return True
     
-    def _format_cross_exchange_message(self, opp: Opportunity) -> str:
-        """Format cross-exchange opportunity message.
+    def _check_and_mark(self, key: int, now: float) -> bool:
+        """Check an alert against the dedupe table and record it if new.
         
         Args:
-            opp: Cross-exchange opportunity
+            key: Hashed deduplication key
+            now: Current monotonic time in seconds
             
         Returns:
-            Formatted message string
+            True if duplicate within TTL, False if newly marked as sent
         """
-        timestamp = opp.timestamp.strftime("%H:%M:%S UTC")
+        # Clean expired entries
+        self._clean_old_alerts(now)
+        
+        if now - self._bloom_rotated_at >= self.alert_ttl_seconds:
+            self._rotate_bloom(now)
+        
+        sent_alerts = self.sent_alerts
+        bloom, bloom_prev = self._bloom, self._bloom_prev
+        lo = key & BLOOM_MASK
+        hi = (key >> 32) & BLOOM_MASK
+        
+        # Only possible repeats pay for the exact lookup
+        if (bloom[lo] or bloom_prev[lo]) and (bloom[hi] or bloom_prev[hi]):
+            expiry = sent_alerts.get(key)
+            if expiry is not None and expiry > now:
+                return True
+        
+        bloom[lo] = 1
+        bloom[hi] = 1
+        
+        # Any surviving entry for this key is live, so a miss means it is absent
+        # and the new entry lands at the end of the expiry order
+        sent_alerts[key] = now + self.alert_ttl_seconds
         
-        message = f"""🔄 [ARB] {opp.symbol} {opp.buy_exchange}→{opp.sell_exchange}
-💰 Spread: {opp.spread_bps:.2f} bps | Notional: ${opp.notional:.0f}
-📊 Buy@{opp.buy_price_after_fees:.6f} / Sell@{opp.sell_price_after_fees:.6f}
-📈 Depth: top{max(opp.buy_depth_levels, opp.sell_depth_levels)} | Fees: taker | Mode: {opp.mode}
-🕐 {timestamp}"""
+        # Cap the table, evicting the entries closest to expiry
+        while len(sent_alerts) > MAX_DEDUPE_ENTRIES:
+            sent_alerts.popitem(last=False)
         
-        return message
+        return False
     
-    def _format_triangular_message(self, opp: TriOpportunity) -> str:
-        """Format triangular opportunity message.
+    def _rotate_bloom(self, now: float) -> None:
+        """Age the Bloom filter by one generation.
+        
+        A generation spans one TTL, so every live dedupe entry was marked in
+        the current or previous generation.
         
         Args:
-            opp: Triangular opportunity
-            
-        Returns:
-            Formatted message string
+            now: Current monotonic time in seconds
         """
-        timestamp = opp.timestamp.strftime("%H:%M:%S UTC")
-        path_str = "→".join(opp.path)
-        
-        message = f"""🔺 [TRI] {opp.exchange} {opp.base_asset} cycle: {path_str}
-💎 Gain: {opp.gain_bps:.2f} bps | Start: {opp.start_amount:.0f} {opp.base_asset} → End: {opp.end_amount:.4f} {opp.base_asset}
-🔗 Leg1 {opp.leg1_symbol} @ {opp.leg1_price:.6f} | Leg2 {opp.leg2_symbol} @ {opp.leg2_price:.6f} | Leg3 {opp.leg3_symbol} @ {opp.leg3_price:.6f}
-📊 Depth: combined | Fees: taker
-🕐 {timestamp}"""
-        
-        return message
+        if now - self._bloom_rotated_at >= 2 * self.alert_ttl_seconds:
+            # Both generations are stale
+            self._bloom_prev = bytearray(BLOOM_SLOTS)
+        else:
+            self._bloom_prev = self._bloom
+        self._bloom = bytearray(BLOOM_SLOTS)
+        self._bloom_rotated_at = now
     
-    def _is_duplicate(self, dedupe_key: str) -> bool:
-        """Check if an alert is a duplicate within TTL.
+    def _enqueue(self, message: str) -> bool:
+        """Queue a message for sending without blocking.
         
         Args:
-            dedupe_key: Deduplication key
+            message: Message to queue
             
         Returns:
-            True if duplicate, False otherwise
+            True if queued, False if the queue is full
         """
-        now = datetime.utcnow()
-        
-        # Clean old entries
-        self._clean_old_alerts(now)
-        
-        # Check if key exists and is within TTL
-        if dedupe_key in self.sent_alerts:
-            age = now - self.sent_alerts[dedupe_key]
-            return age < self.alert_ttl
+        if len(self._pending) >= MAX_QUEUED_ALERTS:
+            logger.warning("Alert dropped, send queue full")
+            return False
         
-        return False
+        self._pending.append(message)
+        self._drained.clear()
+        self._wake.set()
+        return True
     
-    def _mark_sent(self, dedupe_key: str) -> None:
-        """Mark an alert as sent.
+    def _clean_old_alerts(self, now: float) -> None:
+        """Evict expired alert records.
         
-        Args:
-            dedupe_key: Deduplication key
-        """
-        self.sent_alerts[dedupe_key] = datetime.utcnow()
-    
-    def _clean_old_alerts(self, now: datetime) -> None:
-        """Clean old alert records.
+        Entries are kept in expiry order, so only the expired prefix is visited.
         
         Args:
-            now: Current timestamp
+            now: Current monotonic time in seconds
         """
-        # Remove entries older than TTL
-        to_remove = [
-            key for key, timestamp in self.sent_alerts.items()
-            if now - timestamp > self.alert_ttl
-        ]
-        
-        for key in to_remove:
-            del self.sent_alerts[key]
+        sent_alerts = self.sent_alerts
+        while sent_alerts:
+            key, expiry = next(iter(sent_alerts.items()))
+            if expiry > now:
+                break
+            sent_alerts.popitem(last=False)
     
     async def _process_send_queue(self) -> None:
-        """Process the send queue with rate limiting."""
+        """Process the send queue, coalescing pending alerts into rate-limited batches."""
         while True:
+            # Wait for the first message of the next batch
             try:
-                # Wait for message
-                message = await self.send_queue.get()
-                
-                # Apply rate limiting
-                now = datetime.utcnow()
-                time_since_last = now - self.last_send_time
-                
-                if time_since_last < self.min_send_interval:
-                    sleep_time = (self.min_send_interval - time_since_last).total_seconds()
-                    await asyncio.sleep(sleep_time)
-                
-                # Send message
-                success = await self._send_message(message)
-                
-                if success:
-                    self.last_send_time = datetime.utcnow()
-                    logger.debug("Alert sent successfully")
-                else:
-                    logger.warning("Failed to send alert")
-                
-                # Mark task as done
-                self.send_queue.task_done()
-                
+                first = await self._next_message()
+            except asyncio.CancelledError:
+                break
+            
+            try:
+                await self._send_round(first)
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Error in send queue processor: {e}")
-                await asyncio.sleep(1)
+                logger.error("Error in send queue processor: %s", e)
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    break
+            finally:
+                if not self._pending and self._carry_over is None:
+                    self._drained.set()
+    
+    async def _next_message(self) -> str:
+        """Wait for the message that starts the next batch.
+        
+        Returns:
+            The carried-over message, or the oldest pending one
+        """
+        if self._carry_over is not None:
+            first, self._carry_over = self._carry_over, None
+            return first
+        
+        while not self._pending:
+            self._wake.clear()
+            await self._wake.wait()
+        return self._pending.popleft()
+    
+    async def _send_round(self, first: str) -> None:
+        """Send one rate-limited coalesced batch.
+        
+        Args:
+            first: Message that starts the batch
+        """
+        # Apply rate limiting between batches, trading latency for fewer API calls in bursts
+        if len(self._pending) > BURST_BACKLOG:
+            interval = BURST_SEND_INTERVAL
+        else:
+            interval = self.min_send_interval
+        time_since_last = self._clock() - self.last_send_time
+        
+        if time_since_last < interval:
+            await asyncio.sleep(interval - time_since_last)
+        
+        # Coalesce everything queued up while we were waiting; anything that does not
+        # fit is carried over to the next round, keeping batches in order and the
+        # chat within Telegram's per-chat rate limit
+        message = self._drain(first)
+        
+        if await self._send_message(message):
+            self.last_send_time = self._clock()
+            self._retrying = False
+            self._sent_count += 1
+            if self._sent_count % SENT_LOG_INTERVAL == 0:
+                logger.info("Sent %d alert batches", self._sent_count)
+        elif not self._retrying:
+            # Retry the batch once, ahead of anything still queued
+            logger.warning("Failed to send alert batch, retrying next round")
+            self._retrying = True
+            if self._carry_over is not None:
+                self._pending.appendleft(self._carry_over)
+            self._carry_over = message
+        else:
+            logger.warning("Failed to send alert batch after retry, dropping it")
+            self._retrying = False
+    
+    def _drain(self, first: str, max_chars: int = MAX_BATCH_CHARS) -> str:
+        """Join queued messages into a single batch without blocking.
+        
+        Args:
+            first: Message that starts the batch
+            max_chars: Maximum length of the joined batch
+            
+        Returns:
+            Joined batch text; a message that would overflow it is kept for the next batch
+        """
+        pending = self._pending
+        parts = [first]
+        length = len(first)
+        
+        while pending:
+            message = pending.popleft()
+            length += len(BATCH_SEPARATOR) + len(message)
+            if length > max_chars:
+                self._carry_over = message
+                break
+            parts.append(message)
+        
+        return BATCH_SEPARATOR.join(parts)
     
     async def _send_message(self, message: str) -> bool:
         """Send message via Telegram bot.
@@ -252,17 +367,16 @@ class AlertManager:
         try:
             await self.bot.send_message(
                 chat_id=self.chat_id,
-                text=message,
-                parse_mode='Markdown',
+                text=message,  # Plain text: alerts carry no markup and symbols may contain '_'
                 disable_web_page_preview=True
             )
             return True
             
         except TelegramError as e:
-            logger.error(f"Telegram error: {e}")
+            logger.error("Telegram error: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error sending message: {e}")
+            logger.error("Unexpected error sending message: %s", e)
             return False
     
     async def send_status_message(self, status: str) -> bool:
@@ -272,17 +386,12 @@ class AlertManager:
             status: Status message to send
             
         Returns:
-            True if sent successfully
+            True if queued successfully
         """
         if not self.enabled:
             return False
         
-        try:
-            await self.send_queue.put(f"🤖 Bot Status: {status}")
-            return True
-        except Exception as e:
-            logger.error(f"Error queueing status message: {e}")
-            return False
+        return self._enqueue(f"🤖 Bot Status: {status}")
     
     def get_stats(self) -> Dict[str, any]:
         """Get alert manager statistics.
@@ -290,14 +399,116 @@ class AlertManager:
         Returns:
             Dictionary with stats
         """
-        now = datetime.utcnow()
-        
         return {
             'enabled': self.enabled,
-            'queue_size': self.send_queue.qsize(),
+            'queue_size': len(self._pending),
             'deduplication_entries': len(self.sent_alerts),
-            'last_send_age_seconds': (now - self.last_send_time).total_seconds()
+            'sent_batches': self._sent_count,
+            'last_send_age_seconds': self._clock() - self.last_send_time
         }
 
-# Global alert manager instance
-alert_manager = AlertManager()
+class AlertRouter:
+    """Routes alerts to per-chat managers that share one Telegram bot.
+    
+    Each chat gets its own queue and send task, so chats are throttled
+    independently and their sends overlap on the bot's connection pool.
+    """
+    
+    def __init__(self):
+        self.bot: Optional[Bot] = None
+        self.managers: Dict[str, AlertManager] = {}  # chat_id -> manager
+        self.running = False
+        
+        self._initialize_bot()
+    
+    def _initialize_bot(self) -> None:
+        """Initialize Telegram bot if credentials are available."""
+        if not config.TELEGRAM_BOT_TOKEN or not config.TELEGRAM_CHAT_ID:
+            logger.warning("Telegram credentials not configured - alerts disabled")
+            return
+        
+        try:
+            # Keep a small pool of keep-alive connections to api.telegram.org
+            request = HTTPXRequest(connection_pool_size=8, connect_timeout=5.0, read_timeout=10.0)
+            self.bot = Bot(token=config.TELEGRAM_BOT_TOKEN, request=request)
+            logger.info("Telegram bot initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize Telegram bot: {e}")
+            self.bot = None
+    
+    def get_manager(self, chat_id: Optional[str] = None) -> AlertManager:
+        """Get the alert manager for a chat, creating it on first use.
+        
+        Args:
+            chat_id: Target chat, defaults to the configured TELEGRAM_CHAT_ID
+            
+        Returns:
+            AlertManager for the chat; started if the router is running
+        """
+        chat_id = chat_id or config.TELEGRAM_CHAT_ID
+        manager = self.managers.get(chat_id)
+        
+        if manager is None:
+            manager = AlertManager(chat_id, self.bot)
+            self.managers[chat_id] = manager
+            if self.running:
+                manager.start()
+        
+        return manager
+    
+    async def start(self) -> None:
+        """Start the router and every known chat manager."""
+        if not self.bot:
+            logger.info("Alert manager disabled - no Telegram credentials")
+            return
+        
+        # Open the connection pool up front so the first alert skips the handshake
+        try:
+            await self.bot.initialize()
+        except TelegramError as e:
+            logger.error(f"Failed to initialize Telegram bot session: {e}")
+        
+        self.running = True
+        for manager in self.managers.values():
+            manager.start()
+        
+        # Make sure the default chat is live from the start
+        self.get_manager()
+    
+    async def stop(self) -> None:
+        """Stop all chat managers and release the bot session."""
+        self.running = False
+        
+        await asyncio.gather(
+            *(manager.stop() for manager in self.managers.values()),
+            return_exceptions=True
+        )
+        
+        # Return pooled connections
+        if self.bot:
+            try:
+                await self.bot.shutdown()
+            except Exception as e:
+                logger.debug(f"Error shutting down Telegram bot session: {e}")
+    
+    def get_stats(self) -> Dict[str, Dict[str, any]]:
+        """Get per-chat alert statistics.
+        
+        Returns:
+            Dictionary of chat_id -> manager stats
+        """
+        return {chat_id: manager.get_stats() for chat_id, manager in self.managers.items()}
+
+# Global alert router instance
+alert_router = AlertRouter()
+
+def get_alert_manager(chat_id: Optional[str] = None) -> AlertManager:
+    """Get the alert manager for a chat from the global router.
+    
+    Args:
+        chat_id: Target chat, defaults to the configured TELEGRAM_CHAT_ID
+        
+    Returns:
+        AlertManager for the chat
+    """
+    return alert_router.get_manager(chat_id)
@@ -1,11 +1,16 @@
 """Main application orchestrator for the arbitrage bot."""
 
 import asyncio
+import atexit
 import logging
+import queue
+import random
 import signal
 import sys
-from typing import Dict, List, Optional, Set, Tuple
+from time import monotonic_ns
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener
 
 # Try to import uvloop for better performance on Unix systems
 try:
@@ -17,55 +22,88 @@ except ImportError:
 from config import config
 from registry import registry
 from connectors.ccxt_generic import create_connector
+from models import ExchangeHealth, OrderBook
 from engine import ArbitrageEngine
 from tri_engine import TriangularArbitrageEngine
-from alert import alert_manager
+from alert import alert_router, get_alert_manager
 from db import db_manager
 from health import health_monitor
 from symbolmap import symbol_mapper
 
-# Set up logging
+# Set up logging: the event loop only enqueues records, a listener thread does the I/O
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers: List[logging.Handler] = [logging.StreamHandler(), logging.FileHandler('arbitrage_bot.log')]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))  # Final formatting happens in the listener
+
 logging.basicConfig(
     level=getattr(logging, config.LOG_LEVEL.upper()),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('arbitrage_bot.log')
-    ]
+    handlers=[_queue_handler]
 )
 
 logger = logging.getLogger(__name__)
 
+# Polled every second over REST; everything else every 3 seconds
+HIGH_LIQUIDITY_SYMBOLS = frozenset({'BTC/USDT', 'ETH/USDT', 'BNB/USDT'})
+
+class _ShutdownRequested(Exception):
+    """Raised inside the task group to cancel all background tasks on stop()."""
+
+class _Stats:
+    """Application counters, kept as slot attributes since some are bumped per order book update."""
+    
+    __slots__ = ('opportunities_found', 'tri_opportunities_found', 'alerts_sent', 'order_book_updates')
+    
+    def __init__(self):
+        self.opportunities_found = 0
+        self.tri_opportunities_found = 0
+        self.alerts_sent = 0
+        self.order_book_updates = 0
+    
+    def add_opportunities(self, count: int) -> None:
+        """Count cross-exchange opportunities found by a scan."""
+        self.opportunities_found += count
+    
+    def add_tri_opportunities(self, count: int) -> None:
+        """Count triangular opportunities found by a scan."""
+        self.tri_opportunities_found += count
+
 class ArbitrageBotApp:
     """Main application orchestrator."""
     
     def __init__(self):
         self.running = False
         self.connectors: Dict[str, any] = {}
-        self.connector_tasks: Dict[str, List[asyncio.Task]] = {}
+        self._connector_names: Tuple[str, ...] = ()  # Snapshot of connectors' keys for the scanners
         self.arbitrage_engine = ArbitrageEngine()
         self.tri_engine = TriangularArbitrageEngine()
         
-        # Scanning tasks
-        self.cross_scan_task: Optional[asyncio.Task] = None
-        self.tri_scan_task: Optional[asyncio.Task] = None
-        self.cleanup_task: Optional[asyncio.Task] = None
+        # Background tasks are owned by a single task group while run() is active
+        self._tg: Optional[asyncio.TaskGroup] = None
+        self._stop_event = asyncio.Event()
         
-        # Order book coalescing
-        self.order_book_queues: Dict[Tuple[str, str], asyncio.Queue] = {}
-        self.coalesce_tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+        # Order book coalescing: latest snapshot per (exchange, symbol), flagged when fresh
+        self.latest_book: Dict[Tuple[str, str], OrderBook] = {}
+        self.book_ready: Dict[Tuple[str, str], asyncio.Event] = {}
+        
+        # REST polling: per-exchange due-time schedule and worker count
+        self._rest_schedules: Dict[str, asyncio.PriorityQueue] = {}
+        self._rest_workers: Dict[str, int] = {}
         
         # Stats
         self.start_time = datetime.utcnow()
-        self.stats = {
-            'opportunities_found': 0,
-            'tri_opportunities_found': 0,
-            'alerts_sent': 0,
-            'order_book_updates': 0,
-        }
+        self.stats = _Stats()
     
     async def start(self) -> None:
-        """Start the arbitrage bot."""
+        """Initialize components and connect to exchanges."""
         logger.info("Starting Crypto Arbitrage Alert Bot")
         
         try:
@@ -79,67 +117,69 @@ class ArbitrageBotApp:
             # Discover and connect to exchanges
             await self._discover_and_connect_exchanges()
             
-            # Start data collection
-            await self._start_data_collection()
-            
-            # Start scanning engines
-            await self._start_scanning_engines()
-            
             # Set up signal handlers
             self._setup_signal_handlers()
             
             self.running = True
-            logger.info("Arbitrage bot started successfully")
-            
-            # Send startup notification
-            await alert_manager.send_status_message("Bot started successfully")
             
         except Exception as e:
             logger.error(f"Failed to start arbitrage bot: {e}")
-            await self.stop()
+            await self._shutdown()
             raise
     
+    async def run(self) -> None:
+        """Start the bot and run its background tasks until stop() is requested."""
+        await self.start()
+        
+        try:
+            async with asyncio.TaskGroup() as tg:
+                self._tg = tg
+                
+                # Start data collection
+                await self._start_data_collection()
+                
+                # Start scanning engines
+                await self._start_scanning_engines()
+                
+                # Tear the group down, cancelling every task, once shutdown is requested
+                tg.create_task(self._wait_for_stop())
+                
+                logger.info("Arbitrage bot started successfully")
+                
+                # Send startup notification
+                await get_alert_manager().send_status_message("Bot started successfully")
+        except* _ShutdownRequested:
+            pass
+        finally:
+            self._tg = None
+            await self._shutdown()
+    
     async def stop(self) -> None:
-        """Stop the arbitrage bot."""
+        """Request shutdown of the arbitrage bot."""
         logger.info("Stopping arbitrage bot...")
         self.running = False
+        self._stop_event.set()
+    
+    async def _wait_for_stop(self) -> None:
+        """Wait for a stop request and abort the task group."""
+        await self._stop_event.wait()
+        raise _ShutdownRequested()
+    
+    async def _shutdown(self) -> None:
+        """Disconnect exchanges and stop components after the background tasks are gone."""
+        self.running = False
         
         try:
-            # Stop scanning tasks
-            tasks_to_cancel = []
-            
-            if self.cross_scan_task:
-                tasks_to_cancel.append(self.cross_scan_task)
-            
-            if self.tri_scan_task:
-                tasks_to_cancel.append(self.tri_scan_task)
-            
-            if self.cleanup_task:
-                tasks_to_cancel.append(self.cleanup_task)
-            
-            # Cancel coalescing tasks
-            for task in self.coalesce_tasks.values():
-                tasks_to_cancel.append(task)
-            
-            # Cancel connector tasks
-            for exchange_tasks in self.connector_tasks.values():
-                tasks_to_cancel.extend(exchange_tasks)
-            
-            # Cancel all tasks
-            for task in tasks_to_cancel:
-                task.cancel()
-            
-            # Wait for tasks to complete
-            if tasks_to_cancel:
-                await asyncio.gather(*tasks_to_cancel, return_exceptions=True)
-            
             # Disconnect connectors
-            for connector in self.connectors.values():
-                await connector.disconnect()
+            self._connector_names = ()
+            await asyncio.gather(
+                *(connector.disconnect() for connector in self.connectors.values()),
+                return_exceptions=True
+            )
             
             # Stop components
             await health_monitor.stop()
-            await alert_manager.stop()
+            await alert_router.stop()
             await db_manager.close()
             await registry.cleanup()
             
@@ -155,8 +195,8 @@ class ArbitrageBotApp:
         # Initialize database
         await db_manager.initialize()
         
-        # Initialize alert manager
-        await alert_manager.start()
+        # Initialize alert router
+        await alert_router.start()
         
         # Initialize health monitor
         await health_monitor.start()
@@ -175,46 +215,51 @@ class ArbitrageBotApp:
         
         logger.info(f"Creating connectors for {len(exchanges)} exchanges...")
         
-        # Create connectors for each exchange
-        for exchange_name in exchanges:
-            try:
-                connector = create_connector(exchange_name)
-                
-                if await connector.connect():
-                    self.connectors[exchange_name] = connector
-                    self.connector_tasks[exchange_name] = []
-                    logger.info(f"✓ Connected to {exchange_name}")
-                else:
+        # Connect concurrently, bounded so handshakes don't stampede the network
+        semaphore = asyncio.Semaphore(config.MAX_CONCURRENT_EXCHANGES)
+        
+        async def connect_one(exchange_name: str):
+            async with semaphore:
+                try:
+                    connector = create_connector(exchange_name)
+                    
+                    if await connector.connect():
+                        logger.info(f"✓ Connected to {exchange_name}")
+                        return exchange_name, connector
+                    
                     logger.warning(f"✗ Failed to connect to {exchange_name}")
                     
-            except Exception as e:
-                logger.error(f"Error connecting to {exchange_name}: {e}")
+                except Exception as e:
+                    logger.error(f"Error connecting to {exchange_name}: {e}")
+                
+                return exchange_name, None
+        
+        results = await asyncio.gather(*(connect_one(name) for name in exchanges))
+        
+        # Keep discovery order for the connectors that came up
+        for exchange_name, connector in results:
+            if connector is not None:
+                self.connectors[exchange_name] = connector
         
         if not self.connectors:
             raise RuntimeError("Failed to connect to any exchanges")
         
+        self._connector_names = tuple(self.connectors)
+        
         logger.info(f"Connected to {len(self.connectors)} exchanges")
     
     async def _start_data_collection(self) -> None:
         """Start order book data collection."""
         logger.info("Starting order book data collection...")
+        tg = self._tg
+        assert tg is not None, "data collection must start inside run()"
         
-        # Determine symbols to monitor
-        symbols_to_monitor = set(config.SYMBOL_UNIVERSE)
-        
-        # Add symbols needed for triangular arbitrage
-        for exchange_name in self.connectors.keys():
-            tri_paths = registry.get_triangular_symbols(exchange_name, config.TRI_BASES)
-            for base, asset2, asset3 in tri_paths:
-                # Add required symbols for triangular paths
-                symbols_to_monitor.update([
-                    f"{base}/{asset2}",
-                    f"{asset2}/{asset3}",
-                    f"{asset3}/{base}",
-                    f"{asset2}/{base}",  # Reverse symbols
-                    f"{asset3}/{asset2}",
-                    f"{base}/{asset3}",
-                ])
+        # Determine symbols to monitor, adding those needed for triangular
+        # arbitrage in both directions per leg
+        symbols_to_monitor = config.SYMBOL_UNIVERSE.union(*(
+            registry.get_triangular_symbol_set(exchange_name, config.TRI_BASES)
+            for exchange_name in self.connectors
+        ))
         
         logger.info(f"Monitoring {len(symbols_to_monitor)} symbols across {len(self.connectors)} exchanges")
         
@@ -227,142 +272,173 @@ class ArbitrageBotApp:
             sample_markets = list(exchange_markets.keys())[:5]
             logger.info(f"Sample markets for {exchange_name}: {sample_markets}")
             
-            for symbol in symbols_to_monitor:
-                # Check if exchange supports this symbol
-                normalized_symbol = symbol_mapper.get_exchange_symbol(symbol, exchange_name)
-                
-                if normalized_symbol not in exchange_markets:
-                    logger.debug(f"Symbol {symbol} ({normalized_symbol}) not available on {exchange_name}")
-                    continue
-                
-                logger.info(f"Starting collection for {symbol} on {exchange_name}")
+            # Map monitored symbols to exchange format once, then keep the ones the exchange lists
+            exchange_to_standard = {
+                symbol_mapper.get_exchange_symbol(symbol, exchange_name): symbol
+                for symbol in symbols_to_monitor
+            }
+            supported = exchange_to_standard.keys() & exchange_markets.keys()
+            logger.debug(
+                f"{len(exchange_to_standard) - len(supported)} monitored symbols not available on {exchange_name}"
+            )
+            
+            for normalized_symbol in supported:
+                symbol = exchange_to_standard[normalized_symbol]
+                logger.debug(f"Starting collection for {symbol} on {exchange_name}")
                 
-                # Create order book queue for coalescing
+                # Create order book slot for coalescing
                 queue_key = (exchange_name, symbol)
-                self.order_book_queues[queue_key] = asyncio.Queue(maxsize=2)
+                self.book_ready[queue_key] = asyncio.Event()
                 
                 # Start coalescing task
-                self.coalesce_tasks[queue_key] = asyncio.create_task(
-                    self._coalesce_order_books(queue_key)
-                )
-                
-                # Start data collection task
-                # Force REST polling since WebSocket is not available
-                task = asyncio.create_task(
-                    self._poll_order_book_rest(exchange_name, symbol, connector)
-                )
+                tg.create_task(self._coalesce_order_books(queue_key))
                 
-                self.connector_tasks[exchange_name].append(task)
+                # Start data collection task, streaming where the exchange supports it
+                if connector.supports_websocket():
+                    tg.create_task(self._watch_order_book_ws(
+                        exchange_name, symbol, normalized_symbol, connector
+                    ))
+                else:
+                    self._schedule_rest_poll(exchange_name, symbol, normalized_symbol, connector)
         
         logger.info("Order book data collection started")
     
-    async def _watch_order_book_ws(self, exchange_name: str, symbol: str, connector) -> None:
-        """Watch order book via WebSocket."""
+    async def _watch_order_book_ws(self, exchange_name: str, symbol: str,
+                                   normalized_symbol: str, connector) -> None:
+        """Watch order book via WebSocket, reconnecting with exponential backoff.
+        
+        Falls back to REST polling if the connector turns out not to stream.
+        """
         queue_key = (exchange_name, symbol)
+        ready = self.book_ready[queue_key]
+        health = registry.health.get(exchange_name)
+        publish = self._publish_order_book
+        backoff = 1.0
         
-        try:
-            normalized_symbol = symbol_mapper.get_exchange_symbol(symbol, exchange_name)
-            
-            async for order_book in connector.watch_order_book(normalized_symbol, config.DEPTH_LEVELS):
-                # Update symbol to standard format
-                order_book.symbol = symbol
-                
-                # Queue for coalescing
-                try:
-                    self.order_book_queues[queue_key].put_nowait(order_book)
-                except asyncio.QueueFull:
-                    # Drop oldest update
-                    try:
-                        self.order_book_queues[queue_key].get_nowait()
-                        self.order_book_queues[queue_key].put_nowait(order_book)
-                        
-                        # Update coalescing stats
-                        if exchange_name in registry.health:
-                            health = registry.health[exchange_name]
-                            health.coalesced_updates += 1
-                            
-                    except asyncio.QueueEmpty:
-                        pass
-                
-                self.stats['order_book_updates'] += 1
-                
-        except Exception as e:
-            logger.error(f"WebSocket error for {symbol} on {exchange_name}: {e}")
+        while self.running:
+            try:
+                async for order_book in connector.watch_order_book(
+                    normalized_symbol, config.DEPTH_LEVELS, standard_symbol=symbol
+                ):
+                    publish(queue_key, order_book, ready, health)
+                    backoff = 1.0  # Stream is healthy again
+                
+            except NotImplementedError:
+                logger.info(f"No WebSocket stream for {symbol} on {exchange_name}, falling back to REST")
+                self._schedule_rest_poll(exchange_name, symbol, normalized_symbol, connector)
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"WebSocket error for {symbol} on {exchange_name}: {e}")
             
-            # Update health
+            # Stream ended or failed; back off before resubscribing
             registry.update_health(exchange_name, ws_connected=False)
+            if not self.running:
+                break
+            
+            # Jitter so every pair on a dropped exchange does not resubscribe at once
+            delay = min(random.uniform(backoff / 2, backoff * 1.5), config.BACKOFF_MAX_S)
+            logger.info(f"Reconnecting WebSocket for {symbol} on {exchange_name} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            backoff = min(backoff * 2, config.BACKOFF_MAX_S)
     
-    async def _poll_order_book_rest(self, exchange_name: str, symbol: str, connector) -> None:
-        """Poll order book via REST API."""
-        queue_key = (exchange_name, symbol)
+    def _schedule_rest_poll(self, exchange_name: str, symbol: str,
+                            normalized_symbol: str, connector) -> None:
+        """Add a pair to its exchange's REST polling schedule.
+        
+        Each exchange has one due-time ordered schedule served by a bounded
+        pool of workers, one more per polled pair up to MAX_CONCURRENT_EXCHANGES.
+        """
+        schedule = self._rest_schedules.get(exchange_name)
+        if schedule is None:
+            schedule = self._rest_schedules[exchange_name] = asyncio.PriorityQueue()
+            self._rest_workers[exchange_name] = 0
         
         # Adaptive polling intervals based on symbol liquidity
-        high_liquidity_symbols = {'BTC/USDT', 'ETH/USDT', 'BNB/USDT'}
-        poll_interval = 1.0 if symbol in high_liquidity_symbols else 3.0
+        poll_interval = 1.0 if symbol in HIGH_LIQUIDITY_SYMBOLS else 3.0
+        schedule.put_nowait((asyncio.get_running_loop().time(), symbol, normalized_symbol, poll_interval))
         
-        try:
-            normalized_symbol = symbol_mapper.get_exchange_symbol(symbol, exchange_name)
+        if self._rest_workers[exchange_name] < config.MAX_CONCURRENT_EXCHANGES:
+            tg = self._tg
+            assert tg is not None, "REST polling must start inside run()"
+            self._rest_workers[exchange_name] += 1
+            tg.create_task(self._poll_worker(exchange_name, connector, schedule))
+    
+    async def _poll_worker(self, exchange_name: str, connector, schedule: asyncio.PriorityQueue) -> None:
+        """Poll the pair that is due soonest, then reschedule it.
+        
+        Args:
+            exchange_name: Exchange served by this worker
+            connector: Exchange connector
+            schedule: Heap of (due_time, symbol, normalized_symbol, poll_interval)
+        """
+        loop = asyncio.get_running_loop()
+        health = registry.health.get(exchange_name)
+        
+        while self.running:
+            due, symbol, normalized_symbol, poll_interval = await schedule.get()
             
-            while self.running:
-                order_book = await connector.fetch_order_book(normalized_symbol, config.DEPTH_LEVELS)
+            try:
+                delay = due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                
+                order_book = await connector.fetch_order_book(
+                    normalized_symbol, config.DEPTH_LEVELS, standard_symbol=symbol
+                )
                 
                 if order_book:
-                    # Update symbol to standard format
-                    order_book.symbol = symbol
+                    queue_key = (exchange_name, symbol)
+                    self._publish_order_book(queue_key, order_book, self.book_ready[queue_key], health)
                     
-                    # Queue for coalescing
-                    try:
-                        self.order_book_queues[queue_key].put_nowait(order_book)
-                    except asyncio.QueueFull:
-                        # Drop oldest update
-                        try:
-                            self.order_book_queues[queue_key].get_nowait()
-                            self.order_book_queues[queue_key].put_nowait(order_book)
-                        except asyncio.QueueEmpty:
-                            pass
-                    
-                    self.stats['order_book_updates'] += 1
-                
-                await asyncio.sleep(poll_interval)
-                
-        except Exception as e:
-            logger.error(f"REST polling error for {symbol} on {exchange_name}: {e}")
+            except Exception as e:
+                logger.error(f"REST polling error for {symbol} on {exchange_name}: {e}")
+            finally:
+                schedule.put_nowait((loop.time() + poll_interval, symbol, normalized_symbol, poll_interval))
+    
+    def _publish_order_book(self, queue_key: Tuple[str, str], order_book: OrderBook,
+                            ready: asyncio.Event, health: Optional[ExchangeHealth]) -> None:
+        """Replace the latest order book for a pair and wake its coalescer.
+        
+        Args:
+            queue_key: (exchange, symbol) pair
+            order_book: New order book snapshot
+            ready: The pair's wake-up event, looked up once by the caller
+            health: The exchange's health record, looked up once by the caller
+        """
+        self.latest_book[queue_key] = order_book
+        self.stats.order_book_updates += 1
+        
+        if ready.is_set():
+            # The previous snapshot was never consumed
+            if health:
+                health.coalesced_updates += 1
+        else:
+            ready.set()
     
     async def _coalesce_order_books(self, queue_key: Tuple[str, str]) -> None:
         """Coalesce order book updates to reduce processing load."""
-        exchange_name, symbol = queue_key
+        ready = self.book_ready[queue_key]
+        coalesce_s = config.COALESCE_S
+        latest_book = self.latest_book
+        update_cross = self.arbitrage_engine.update_order_book
+        update_tri = self.tri_engine.update_order_book
         
         while self.running:
             try:
-                # Wait for order book with timeout
-                order_book = await asyncio.wait_for(
-                    self.order_book_queues[queue_key].get(),
-                    timeout=1.0
-                )
-                
-                # Wait for coalescing window
-                await asyncio.sleep(config.COALESCE_MS / 1000.0)
+                # Wait for a fresh order book; shutdown cancels this task via the task group
+                await ready.wait()
                 
-                # Get the latest update (drop intermediate ones)
-                latest_book = order_book
-                while True:
-                    try:
-                        latest_book = self.order_book_queues[queue_key].get_nowait()
-                    except asyncio.QueueEmpty:
-                        break
+                # Wait for coalescing window; later updates overwrite the slot
+                await asyncio.sleep(coalesce_s)
+                ready.clear()
+                order_book = latest_book[queue_key]
                 
                 # Update engines with latest order book
-                self.arbitrage_engine.update_order_book(latest_book)
-                self.tri_engine.update_order_book(latest_book)
+                update_cross(order_book)
+                update_tri(order_book)
                 
-                # Update queue length stat
-                registry.update_health(
-                    exchange_name,
-                    queue_length=self.order_book_queues[queue_key].qsize()
-                )
-                
-            except asyncio.TimeoutError:
-                continue
             except Exception as e:
                 logger.error(f"Error in coalescing for {queue_key}: {e}")
                 await asyncio.sleep(1)
@@ -370,117 +446,139 @@ class ArbitrageBotApp:
     async def _start_scanning_engines(self) -> None:
         """Start the opportunity scanning engines."""
         logger.info("Starting scanning engines...")
+        tg = self._tg
+        assert tg is not None, "scanning engines must start inside run()"
         
         # Start cross-exchange arbitrage scanner
-        self.cross_scan_task = asyncio.create_task(self._cross_exchange_scan_loop())
+        tg.create_task(self._cross_exchange_scan_loop())
         
         # Start triangular arbitrage scanner
-        self.tri_scan_task = asyncio.create_task(self._triangular_scan_loop())
+        tg.create_task(self._triangular_scan_loop())
         
         # Start cleanup task
-        self.cleanup_task = asyncio.create_task(self._cleanup_loop())
+        tg.create_task(self._cleanup_loop())
+        
+        # Start periodic stats logging
+        tg.create_task(self._stats_log_loop())
         
         logger.info("Scanning engines started")
     
     async def _cross_exchange_scan_loop(self) -> None:
         """Cross-exchange arbitrage scanning loop."""
-        while self.running:
-            try:
-                start_time = asyncio.get_event_loop().time()
-                
-                # Scan for opportunities
-                opportunities = await self.arbitrage_engine.scan_opportunities(
-                    symbols=config.SYMBOL_UNIVERSE,
-                    exchanges=list(self.connectors.keys())
-                )
-                
-                # Process opportunities
-                for opportunity in opportunities:
-                    self.stats['opportunities_found'] += 1
-                    
-                    # Store in database
-                    await db_manager.store_opportunity(opportunity)
-                    
-                    # Send alert
-                    if await alert_manager.send_cross_exchange_alert(opportunity):
-                        self.stats['alerts_sent'] += 1
-                
-                # Adaptive scanning interval
-                scan_time = (asyncio.get_event_loop().time() - start_time) * 1000
-                base_interval = config.TRI_SCAN_MS / 1000.0
-                
-                # Increase interval if scanning is slow
-                if scan_time > base_interval * 1000:
-                    sleep_time = base_interval * 1.5
-                else:
-                    sleep_time = base_interval
-                
-                await asyncio.sleep(sleep_time)
-                
-            except Exception as e:
-                logger.error(f"Error in cross-exchange scan loop: {e}")
-                await asyncio.sleep(5)
+        await self._run_scan(
+            "cross-exchange",
+            lambda: self.arbitrage_engine.scan_opportunities(
+                symbols=config.SYMBOL_UNIVERSE_LIST,
+                exchanges=self._connector_names
+            ),
+            db_manager.store_opportunities_bulk,
+            lambda opportunity: get_alert_manager().send_cross_exchange_alert(opportunity),
+            self.stats.add_opportunities
+        )
     
     async def _triangular_scan_loop(self) -> None:
         """Triangular arbitrage scanning loop."""
+        await self._run_scan(
+            "triangular",
+            lambda: self.tri_engine.scan_opportunities(exchanges=self._connector_names),
+            db_manager.store_tri_opportunities_bulk,
+            lambda opportunity: get_alert_manager().send_triangular_alert(opportunity),
+            self.stats.add_tri_opportunities
+        )
+    
+    async def _run_scan(self, label: str, scan: Callable[[], Awaitable[list]],
+                        store: Callable[[list], Awaitable[None]],
+                        alert: Callable[[Any], Awaitable[bool]], count: Callable[[int], None]) -> None:
+        """Drive a scanning loop: scan, store and alert, then sleep adaptively.
+        
+        Args:
+            label: Scanner name for logging
+            scan: Coroutine factory returning the opportunities found
+            store: Persists a list of opportunities in one call
+            alert: Sends one opportunity alert, returning True if queued
+            count: Adds the number of opportunities found to its _Stats counter
+        """
+        base_interval = config.TRI_SCAN_S
+        base_interval_ns = config.TRI_SCAN_NS
+        stats = self.stats
+        
         while self.running:
             try:
-                start_time = asyncio.get_event_loop().time()
+                t0 = monotonic_ns()
                 
-                # Scan for triangular opportunities
-                opportunities = await self.tri_engine.scan_opportunities(
-                    exchanges=list(self.connectors.keys())
-                )
+                # Scan for opportunities
+                opportunities = await scan()
                 
                 # Process opportunities
-                for opportunity in opportunities:
-                    self.stats['tri_opportunities_found'] += 1
+                if opportunities:
+                    count(len(opportunities))
                     
                     # Store in database
-                    await db_manager.store_tri_opportunity(opportunity)
+                    await store(opportunities)
                     
-                    # Send alert
-                    if await alert_manager.send_triangular_alert(opportunity):
-                        self.stats['alerts_sent'] += 1
-                
-                # Adaptive scanning interval
-                scan_time = (asyncio.get_event_loop().time() - start_time) * 1000
-                base_interval = config.TRI_SCAN_MS / 1000.0
+                    # Send alerts
+                    sent = await asyncio.gather(*(alert(opportunity) for opportunity in opportunities))
+                    stats.alerts_sent += sum(sent)
                 
-                if scan_time > base_interval * 1000:
-                    sleep_time = base_interval * 1.5
-                else:
-                    sleep_time = base_interval
+                # Adaptive scanning interval: back off if scanning is slow
+                scan_ns = monotonic_ns() - t0
+                sleep_time = base_interval * 1.5 if scan_ns > base_interval_ns else base_interval
                 
                 await asyncio.sleep(sleep_time)
                 
             except Exception as e:
-                logger.error(f"Error in triangular scan loop: {e}")
+                logger.error(f"Error in {label} scan loop: {e}")
                 await asyncio.sleep(5)
     
     async def _cleanup_loop(self) -> None:
-        """Periodic cleanup loop."""
+        """Weekly cleanup loop, run at the start of each Monday (UTC)."""
         while self.running:
             try:
-                # Clean up old database data weekly
-                if datetime.utcnow().weekday() == 0:  # Monday
-                    await db_manager.cleanup_old_data(days=7)
+                # Sleep until next Monday 00:00 UTC
+                now = datetime.utcnow()
+                days_ahead = 7 - now.weekday()
+                next_run = datetime(now.year, now.month, now.day) + timedelta(days=days_ahead)
+                await asyncio.sleep((next_run - now).total_seconds())
                 
-                # Sleep for 1 hour
-                await asyncio.sleep(3600)
+                # Clean up old database data
+                await db_manager.cleanup_old_data(days=7)
                 
             except Exception as e:
                 logger.error(f"Error in cleanup loop: {e}")
                 await asyncio.sleep(300)  # 5 minutes on error
     
+    async def _stats_log_loop(self) -> None:
+        """Log stats once a minute."""
+        while self.running:
+            await asyncio.sleep(60)
+            
+            try:
+                stats = self.get_stats()
+                logger.info(f"Stats: {stats['opportunities']} | {stats['data_flow']}")
+            except Exception as e:
+                # An error here must not tear down the task group and every collector with it
+                logger.error(f"Error logging stats: {e}")
+    
     def _setup_signal_handlers(self) -> None:
-        """Set up signal handlers for graceful shutdown."""
-        def signal_handler(signum, frame):
+        """Set up signal handlers for graceful shutdown.
+        
+        Must be called with the event loop running so handlers are registered
+        on the loop itself instead of interrupting it from a signal context.
+        """
+        loop = asyncio.get_running_loop()
+        
+        def request_stop(signum) -> None:
             logger.info(f"Received signal {signum}, shutting down...")
-            asyncio.create_task(self.stop())
+            loop.create_task(self.stop())
+        
+        if sys.platform == 'win32':
+            # Windows loops do not support add_signal_handler
+            signal.signal(signal.SIGINT, lambda signum, frame: loop.call_soon_threadsafe(request_stop, signum))
+            signal.signal(signal.SIGTERM, lambda signum, frame: loop.call_soon_threadsafe(request_stop, signum))
+            return
         
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            loop.add_signal_handler(sig, request_stop, sig)
     
     def get_stats(self) -> Dict[str, any]:
         """Get application statistics."""
@@ -492,56 +590,56 @@ class ArbitrageBotApp:
                 'uptime_seconds': uptime.total_seconds(),
                 'start_time': self.start_time.isoformat(),
                 'connected_exchanges': len(self.connectors),
-                'active_symbols': len(self.order_book_queues),
+                'active_symbols': len(self.book_ready),
             },
             'opportunities': {
-                'cross_exchange_found': self.stats['opportunities_found'],
-                'triangular_found': self.stats['tri_opportunities_found'],
-                'alerts_sent': self.stats['alerts_sent'],
+                'cross_exchange_found': self.stats.opportunities_found,
+                'triangular_found': self.stats.tri_opportunities_found,
+                'alerts_sent': self.stats.alerts_sent,
             },
             'data_flow': {
-                'order_book_updates': self.stats['order_book_updates'],
-                'active_queues': len([q for q in self.order_book_queues.values() if q.qsize() > 0]),
+                'order_book_updates': self.stats.order_book_updates,
+                'active_queues': sum(1 for ready in self.book_ready.values() if ready.is_set()),
             },
             'engines': {
                 'arbitrage_engine': self.arbitrage_engine.get_stats(),
                 'tri_engine': self.tri_engine.get_stats(),
             },
             'components': {
-                'alert_manager': alert_manager.get_stats(),
+                'alert_manager': alert_router.get_stats(),
                 'db_manager': db_manager.get_stats(),
             }
         }
 
 async def main():
     """Main application entry point."""
-    # Install uvloop for better performance on Unix systems
-    if UVLOOP_AVAILABLE:
-        uvloop.install()
+    # The entry point picks the event loop; report which one is driving us
+    if UVLOOP_AVAILABLE and isinstance(asyncio.get_running_loop(), uvloop.Loop):
         logging.info("Using uvloop for enhanced performance")
     else:
-        logging.info("uvloop not available, using default asyncio event loop")
+        logging.info("Using default asyncio event loop")
     
     app = ArbitrageBotApp()
     
     try:
-        await app.start()
-        
-        # Keep running until stopped
-        while app.running:
-            await asyncio.sleep(1)
-            
-            # Periodically log stats
-            if datetime.utcnow().second % 60 == 0:  # Every minute
-                stats = app.get_stats()
-                logger.info(f"Stats: {stats['opportunities']} | {stats['data_flow']}")
+        # Runs until a signal or fatal error stops the bot
+        await app.run()
     
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt")
     except Exception as e:
         logger.error(f"Application error: {e}")
-    finally:
-        await app.stop()
+
+def run_main() -> None:
+    """Run main() on uvloop when available, otherwise on the default loop.
+    
+    The loop has to be chosen before it is created; installing uvloop from
+    inside main() would be too late to affect the running loop.
+    """
+    if UVLOOP_AVAILABLE:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_main()
@@ -1,14 +1,39 @@
 """Configuration loader for the arbitrage bot."""
 
 import os
-from typing import List, Optional, Dict, Any
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, FrozenSet, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+@lru_cache(maxsize=None)
+def _parse_fee_overrides() -> Dict[str, Dict[str, float]]:
+    """Parse ``<EXCHANGE>_<TAKER|MAKER>_FEE`` variables from the environment once."""
+    overrides: Dict[str, Dict[str, float]] = {}
+    
+    for key, value in os.environ.items():
+        if "_TAKER_FEE" in key or "_MAKER_FEE" in key:
+            try:
+                parts = key.split("_")
+                if len(parts) >= 3:
+                    exchange = parts[0].lower()
+                    fee_type = parts[1].lower()  # "taker" or "maker"
+                    
+                    if exchange not in overrides:
+                        overrides[exchange] = {}
+                    
+                    overrides[exchange][fee_type] = float(value)
+            except (ValueError, IndexError):
+                continue
+    
+    return overrides
+
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Application configuration."""
+    """Application configuration, read from the environment once at import."""
     
     # Telegram
     TELEGRAM_BOT_TOKEN: str = os.getenv("TELEGRAM_BOT_TOKEN", "")
@@ -19,33 +44,37 @@ class Config:
     MIN_TRI_GAIN_BPS: float = float(os.getenv("MIN_TRI_GAIN_BPS", "30.0"))
     MIN_NOTIONAL: float = float(os.getenv("MIN_NOTIONAL", "100.0"))
     
-    # Symbol Universe
-    SYMBOL_UNIVERSE: List[str] = [
+    # Symbol Universe (ordered list for iteration, frozenset for membership tests)
+    SYMBOL_UNIVERSE_LIST: Tuple[str, ...] = tuple(dict.fromkeys(
         s.strip() for s in os.getenv(
             "SYMBOL_UNIVERSE", 
             "BTC/USDT,ETH/USDT,SOL/USDT,XRP/USDT,BNB/USDT,ADA/USDT,DOGE/USDT,TON/USDT,AVAX/USDT,LINK/USDT"
         ).split(",") if s.strip()
-    ]
+    ))
+    SYMBOL_UNIVERSE: FrozenSet[str] = frozenset(SYMBOL_UNIVERSE_LIST)
     
     # Triangular Arbitrage
-    TRI_BASES: List[str] = [
+    TRI_BASES: Tuple[str, ...] = tuple(
         s.strip() for s in os.getenv("TRI_BASES", "USDT,USDC,BTC").split(",") if s.strip()
-    ]
+    )
     
-    TRI_EXCLUDE_QUOTES: List[str] = [
+    TRI_EXCLUDE_QUOTES: FrozenSet[str] = frozenset(
         s.strip() for s in os.getenv("TRI_EXCLUDE_QUOTES", "").split(",") if s.strip()
-    ]
+    )
     
-    # Exchange Filters
-    INCLUDE_EXCHANGES: List[str] = [
-        s.strip() for s in os.getenv(
+    # Exchange Filters (lower-cased for case-insensitive matching)
+    INCLUDE_EXCHANGES: FrozenSet[str] = frozenset(
+        s.strip().lower() for s in os.getenv(
             "INCLUDE_EXCHANGES", 
             "binance,okx,bybit,coinbase,kraken,kucoin,gateio,huobi,btcturk,mexc,cointr"
         ).split(",") if s.strip()
-    ]
-    EXCLUDE_EXCHANGES: List[str] = [
-        s.strip() for s in os.getenv("EXCLUDE_EXCHANGES", "").split(",") if s.strip()
-    ]
+    )
+    EXCLUDE_EXCHANGES: FrozenSet[str] = frozenset(
+        s.strip().lower() for s in os.getenv("EXCLUDE_EXCHANGES", "").split(",") if s.strip()
+    )
+    
+    # Skip TLS certificate verification for CoinTR (testing only)
+    COINTR_INSECURE_SSL: bool = os.getenv("COINTR_INSECURE_SSL", "false").lower() in ("1", "true", "yes")
     
     # Performance
     DEPTH_LEVELS: int = int(os.getenv("DEPTH_LEVELS", "10"))
@@ -53,6 +82,11 @@ class Config:
     TRI_SCAN_MS: int = int(os.getenv("TRI_SCAN_MS", "150"))
     MAX_CONCURRENT_EXCHANGES: int = int(os.getenv("MAX_CONCURRENT_EXCHANGES", "20"))
     
+    # Derived from the millisecond settings above
+    COALESCE_S: float = field(init=False)
+    TRI_SCAN_S: float = field(init=False)
+    TRI_SCAN_NS: int = field(init=False)
+    
     # Logging & DB
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     DB_PATH: str = os.getenv("DB_PATH", "./arbitrage.db")
@@ -62,41 +96,29 @@ class Config:
     MAX_RECONNECT_ATTEMPTS: int = int(os.getenv("MAX_RECONNECT_ATTEMPTS", "5"))
     BACKOFF_MAX_S: int = int(os.getenv("BACKOFF_MAX_S", "60"))
     
-    @classmethod
-    def get_fee_overrides(cls) -> Dict[str, Dict[str, float]]:
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "COALESCE_S", self.COALESCE_MS / 1000.0)
+        object.__setattr__(self, "TRI_SCAN_S", self.TRI_SCAN_MS / 1000.0)
+        object.__setattr__(self, "TRI_SCAN_NS", self.TRI_SCAN_MS * 1_000_000)
+    
+    def get_fee_overrides(self) -> Dict[str, Dict[str, float]]:
         """Extract fee overrides from environment variables.
         
+        The environment is parsed on the first call only; treat the result as read-only.
+        
         Returns:
             Dict mapping exchange names to fee dictionaries.
             Example: {"binance": {"taker": 0.0005, "maker": 0.0008}}
         """
-        overrides: Dict[str, Dict[str, float]] = {}
-        
-        for key, value in os.environ.items():
-            if "_TAKER_FEE" in key or "_MAKER_FEE" in key:
-                try:
-                    parts = key.split("_")
-                    if len(parts) >= 3:
-                        exchange = parts[0].lower()
-                        fee_type = parts[1].lower()  # "taker" or "maker"
-                        
-                        if exchange not in overrides:
-                            overrides[exchange] = {}
-                        
-                        overrides[exchange][fee_type] = float(value)
-                except (ValueError, IndexError):
-                    continue
-        
-        return overrides
+        return _parse_fee_overrides()
     
-    @classmethod
-    def validate(cls) -> bool:
+    def validate(self) -> bool:
         """Validate required configuration."""
-        if not cls.TELEGRAM_BOT_TOKEN:
+        if not self.TELEGRAM_BOT_TOKEN:
             print("Warning: TELEGRAM_BOT_TOKEN not set - alerts disabled")
             return False
         
-        if not cls.TELEGRAM_CHAT_ID:
+        if not self.TELEGRAM_CHAT_ID:
             print("Warning: TELEGRAM_CHAT_ID not set - alerts disabled")
             return False
             
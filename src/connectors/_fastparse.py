@@ -0,0 +1,86 @@
+"""Fast order book level parsing shared by the connectors."""
+
+from typing import Any, Sequence
+import numpy as np
+
+# Try to import numba to compile the level filter/sort loop
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+_EMPTY = np.empty((0, 2), dtype=np.float64)
+_EMPTY.flags.writeable = False  # Shared by every empty side
+
+def _filter_sort_levels_loop(raw: np.ndarray, descending: bool) -> np.ndarray:
+    """Drop non-positive levels and insertion-sort the rest by price.
+    
+    Books are a few dozen levels at most and arrive nearly sorted, so
+    insertion sort beats a general-purpose sort here. Compiled with numba
+    when it is available.
+    """
+    out = np.empty((raw.shape[0], 2), dtype=np.float64)
+    m = 0
+    
+    for i in range(raw.shape[0]):
+        price = raw[i, 0]
+        amount = raw[i, 1]
+        # Written so NaN (from None or 'nan' in the feed) is dropped as well
+        if not (price > 0.0 and amount > 0.0):
+            continue
+        
+        j = m
+        if descending:
+            while j > 0 and out[j - 1, 0] < price:
+                out[j, 0] = out[j - 1, 0]
+                out[j, 1] = out[j - 1, 1]
+                j -= 1
+        else:
+            while j > 0 and out[j - 1, 0] > price:
+                out[j, 0] = out[j - 1, 0]
+                out[j, 1] = out[j - 1, 1]
+                j -= 1
+        
+        out[j, 0] = price
+        out[j, 1] = amount
+        m += 1
+    
+    return out[:m]
+
+def _filter_sort_levels_numpy(raw: np.ndarray, descending: bool) -> np.ndarray:
+    """Drop non-positive levels and stable-sort the rest by price.
+    
+    Filtering and ordering are resolved to one index array so the rows
+    are gathered in a single copy.
+    """
+    keep = np.flatnonzero((raw[:, 0] > 0) & (raw[:, 1] > 0))
+    prices = raw[keep, 0]
+    return raw[keep[np.argsort(-prices if descending else prices, kind='stable')]]
+
+if NUMBA_AVAILABLE:
+    _filter_sort_levels = njit(cache=True)(_filter_sort_levels_loop)
+else:
+    _filter_sort_levels = _filter_sort_levels_numpy
+
+def parse_levels(raw_levels: Sequence[Sequence[Any]],
+                 descending: bool = False) -> np.ndarray:
+    """Convert raw [price, amount, ...] rows into a sorted (N, 2) float64 array.
+    
+    Args:
+        raw_levels: Rows from the exchange; numeric strings are accepted
+        descending: Sort by price highest first (bids) instead of lowest first (asks)
+    
+    Returns:
+        Array of [price, amount] rows with non-positive levels removed
+    """
+    try:
+        raw = np.asarray(raw_levels, dtype=np.float64)
+    except ValueError:
+        # Ragged rows (some exchanges append order counts); keep price and amount
+        raw = np.asarray([row[:2] for row in raw_levels if len(row) >= 2], dtype=np.float64)
+    
+    if raw.ndim != 2 or raw.shape[0] == 0 or raw.shape[1] < 2:
+        return _EMPTY
+    
+    return _filter_sort_levels(np.ascontiguousarray(raw[:, :2]), descending)
@@ -1,16 +1,128 @@
 """Abstract base class for exchange connectors."""
 
 from abc import ABC, abstractmethod
-from typing import AsyncGenerator, Optional, List, Dict, Any
-from datetime import datetime
+from typing import AsyncGenerator, Callable, Optional, List, Dict, Any, Literal
+from datetime import datetime, timedelta
 import asyncio
-import sys
-from pathlib import Path
+import logging
+import random
+import time
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from models import OrderBook, FeesPublic
+from ._fastparse import parse_levels
 
-from models import OrderBook, DepthLevel, FeesPublic
+logger = logging.getLogger(__name__)
+
+# Upper bound on any reconnect delay, in seconds
+MAX_BACKOFF_S = 30.0
+
+# Consecutive failures that open a connector's circuit breaker, and how long it stays open
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN_S = 30.0
+
+def jittered_backoff(attempt: int, cap: float = MAX_BACKOFF_S) -> float:
+    """Exponential backoff delay with jitter so reconnects do not arrive in lockstep.
+    
+    Args:
+        attempt: Zero-based attempt number
+        cap: Maximum delay in seconds
+        
+    Returns:
+        Delay drawn from [base/2, base*1.5] where base = min(2**attempt, cap), capped at cap
+    """
+    base = min(2 ** attempt, cap)
+    return min(cap, random.uniform(base / 2, base * 1.5))
+
+class TokenBucket:
+    """Asynchronous token bucket limiting the request rate to one exchange."""
+    
+    def __init__(self, rate: float, capacity: float = 1.0,
+                 clock: Optional[Callable[[], float]] = None):
+        """Initialize a full bucket.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held, i.e. the allowed burst
+            clock: Monotonic clock, normally the running loop's time; looked up on first use if omitted
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill: Optional[float] = None
+        self._clock = clock
+    
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        if self._clock is None:
+            self._clock = asyncio.get_running_loop().time
+        clock = self._clock
+        
+        while True:
+            now = clock()
+            if self.last_refill is not None:
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class CircuitBreaker:
+    """Stops calls to an exchange that keeps failing until a cooldown has passed.
+    
+    The breaker opens after ``threshold`` consecutive failures and refuses calls
+    for ``cooldown`` seconds. It then goes half-open and lets a single probe
+    through: success closes it, failure opens it again. If the probe never
+    reports back, another one is allowed after a further cooldown.
+    """
+    
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN_S,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize a closed breaker.
+        
+        Args:
+            threshold: Consecutive failures that open the breaker
+            cooldown: Seconds to refuse calls once open
+            clock: Monotonic clock in seconds
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state: Literal['closed', 'open', 'half'] = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self._clock = clock
+    
+    def allow(self) -> bool:
+        """Check whether a call may proceed.
+        
+        Returns:
+            True if the breaker is closed or this call is the half-open probe
+        """
+        if self.state == 'closed':
+            return True
+        
+        now = self._clock()
+        if now - self.opened_at < self.cooldown:
+            return False
+        
+        # Cooldown over: let one probe through and hold the rest for another cooldown
+        self.state = 'half'
+        self.opened_at = now
+        return True
+    
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        self.failures = 0
+        self.state = 'closed'
+    
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker at the threshold or on a failed probe."""
+        self.failures += 1
+        if self.state == 'half' or self.failures >= self.threshold:
+            self.state = 'open'
+            self.opened_at = self._clock()
 
 class AbstractExchangeConnector(ABC):
     """Abstract base class for exchange connectors."""
@@ -18,9 +130,17 @@ class AbstractExchangeConnector(ABC):
     def __init__(self, exchange_name: str):
         self.exchange_name = exchange_name
         self.is_connected = False
-        self.last_message_time: Optional[datetime] = None
+        self._last_message_mono: Optional[float] = None  # time.monotonic() of the last message
         self.error_count = 0
         self.reconnect_count = 0
+        self.breaker = CircuitBreaker()
+    
+    @property
+    def last_message_time(self) -> Optional[datetime]:
+        """UTC time of the last message, materialized from the monotonic stamp on read."""
+        if self._last_message_mono is None:
+            return None
+        return datetime.utcnow() - timedelta(seconds=time.monotonic() - self._last_message_mono)
         
     @abstractmethod
     async def connect(self) -> bool:
@@ -37,12 +157,14 @@ class AbstractExchangeConnector(ABC):
         pass
     
     @abstractmethod
-    async def watch_order_book(self, symbol: str, limit: int = 10) -> AsyncGenerator[OrderBook, None]:
+    async def watch_order_book(self, symbol: str, limit: int = 10,
+                               standard_symbol: Optional[str] = None) -> AsyncGenerator[OrderBook, None]:
         """Watch order book updates via WebSocket (if supported).
         
         Args:
             symbol: Trading symbol to watch
             limit: Number of price levels to retrieve
+            standard_symbol: Symbol to stamp on yielded books (defaults to symbol)
             
         Yields:
             OrderBook updates
@@ -50,12 +172,14 @@ class AbstractExchangeConnector(ABC):
         pass
     
     @abstractmethod
-    async def fetch_order_book(self, symbol: str, limit: int = 10) -> Optional[OrderBook]:
+    async def fetch_order_book(self, symbol: str, limit: int = 10,
+                               standard_symbol: Optional[str] = None) -> Optional[OrderBook]:
         """Fetch order book snapshot via REST API.
         
         Args:
             symbol: Trading symbol
             limit: Number of price levels to retrieve
+            standard_symbol: Symbol to stamp on the returned book (defaults to symbol)
             
         Returns:
             OrderBook snapshot or None if failed
@@ -91,35 +215,16 @@ class AbstractExchangeConnector(ABC):
             Parsed OrderBook or None if parsing failed
         """
         try:
-            # Parse bids and asks
-            bids = []
-            asks = []
-            
-            raw_bids = data.get('bids', [])
-            raw_asks = data.get('asks', [])
-            
-            for bid in raw_bids:
-                if len(bid) >= 2:
-                    price = float(bid[0])
-                    amount = float(bid[1])
-                    if price > 0 and amount > 0:
-                        bids.append(DepthLevel(price=price, amount=amount))
-            
-            for ask in raw_asks:
-                if len(ask) >= 2:
-                    price = float(ask[0])
-                    amount = float(ask[1])
-                    if price > 0 and amount > 0:
-                        asks.append(DepthLevel(price=price, amount=amount))
-            
-            # Sort bids (highest first) and asks (lowest first)
-            bids.sort(key=lambda x: x.price, reverse=True)
-            asks.sort(key=lambda x: x.price)
+            # Parse bids (highest first) and asks (lowest first)
+            bids = parse_levels(data.get('bids') or [], descending=True)
+            asks = parse_levels(data.get('asks') or [])
             
-            timestamp = datetime.utcnow()
-            if 'timestamp' in data and data['timestamp']:
+            # Exchange time in ms when present, otherwise local receive time
+            ts = data.get('timestamp')
+            timestamp_ns = time.time_ns()
+            if ts:
                 try:
-                    timestamp = datetime.fromtimestamp(data['timestamp'] / 1000)
+                    timestamp_ns = int(ts * 1_000_000)
                 except (ValueError, TypeError):
                     pass
             
@@ -128,12 +233,12 @@ class AbstractExchangeConnector(ABC):
                 exchange=self.exchange_name,
                 bids=bids,
                 asks=asks,
-                timestamp=timestamp,
+                timestamp_ns=timestamp_ns,
                 nonce=data.get('nonce')
             )
             
         except Exception as e:
-            print(f"Error parsing order book for {symbol} on {self.exchange_name}: {e}")
+            logger.warning("Error parsing order book for %s on %s: %s", symbol, self.exchange_name, e)
             return None
     
     def update_connection_stats(self, error: bool = False) -> None:
@@ -142,7 +247,7 @@ class AbstractExchangeConnector(ABC):
         Args:
             error: Whether this update is due to an error
         """
-        self.last_message_time = datetime.utcnow()
+        self._last_message_mono = time.monotonic()
         
         if error:
             self.error_count += 1
@@ -150,6 +255,8 @@ class AbstractExchangeConnector(ABC):
     async def _handle_reconnect(self, max_attempts: int = 5) -> bool:
         """Handle reconnection with exponential backoff.
         
+        Gives up immediately while the circuit breaker is open.
+        
         Args:
             max_attempts: Maximum number of reconnection attempts
             
@@ -158,18 +265,23 @@ class AbstractExchangeConnector(ABC):
         """
         for attempt in range(max_attempts):
             try:
-                # Exponential backoff: 1s, 2s, 4s, 8s, 16s
-                wait_time = min(2 ** attempt, 60)  # Cap at 60 seconds
-                
+                # Jittered exponential backoff around 1s, 2s, 4s, 8s, 16s
                 if attempt > 0:
-                    await asyncio.sleep(wait_time)
+                    await asyncio.sleep(jittered_backoff(attempt))
+                
+                if not self.breaker.allow():
+                    return False
                 
                 if await self.connect():
+                    self.breaker.record_success()
                     self.reconnect_count += 1
                     return True
+                
+                self.breaker.record_failure()
                     
             except Exception as e:
-                print(f"Reconnection attempt {attempt + 1} failed for {self.exchange_name}: {e}")
+                self.breaker.record_failure()
+                logger.warning("Reconnection attempt %d failed for %s: %s", attempt + 1, self.exchange_name, e)
                 continue
         
         return False
@@ -2,13 +2,8 @@
 
 import asyncio
 import logging
-from typing import AsyncGenerator, Optional, Dict, Any
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Optional, Set, Tuple
 from datetime import datetime
-import sys
-from pathlib import Path
-
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
     import ccxt.pro as ccxtpro
@@ -18,14 +13,115 @@ except ImportError:
     CCXT_PRO_AVAILABLE = False
 
 import ccxt
+import ccxt.async_support as ccxt_async
 
-from .base import AbstractExchangeConnector
+from .base import AbstractExchangeConnector, TokenBucket, jittered_backoff
 from models import OrderBook, FeesPublic
 from fees import fee_manager
 from registry import registry
 
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between WebSocket health updates pushed to the registry
+HEALTH_UPDATE_INTERVAL_S = 0.5
+
+class BatchedOrderBookFetcher:
+    """Collects REST order book requests into short windows and issues them together.
+    
+    Requests for the same (symbol, limit) within a window, or while that
+    request is still in flight, are coalesced onto a single call; each
+    distinct request still goes through the connector's rate-limited fetch.
+    """
+    
+    def __init__(self, fetch_one: Callable[[str, int], Awaitable[Optional[Dict[str, Any]]]],
+                 flush_ms: float = 10.0, max_batch: int = 32):
+        self._fetch_one = fetch_one
+        self.flush_s = flush_ms / 1000.0
+        self.max_batch = max_batch
+        self._pending: Dict[Tuple[str, int], asyncio.Future] = {}
+        self._inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batches: Set[asyncio.Task] = set()
+    
+    async def fetch(self, symbol: str, limit: int) -> Optional[Dict[str, Any]]:
+        """Queue a request and wait for its batch to complete.
+        
+        Args:
+            symbol: Exchange symbol
+            limit: Number of price levels to retrieve
+            
+        Returns:
+            Raw order book, or None if the request failed
+        """
+        key = (symbol, limit)
+        future = self._pending.get(key) or self._inflight.get(key)
+        
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.flush_s, self._flush)
+        
+        # Shield so one cancelled caller does not cancel the request for the others
+        return await asyncio.shield(future)
+    
+    def _flush(self) -> None:
+        """Start a task running every request collected so far."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        batch, self._pending = self._pending, {}
+        if batch:
+            self._inflight.update(batch)
+            task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+    
+    async def _run_batch(self, batch: Dict[Tuple[str, int], asyncio.Future]) -> None:
+        """Fetch a batch concurrently and hand each result to its waiters."""
+        try:
+            await asyncio.gather(
+                *(self._resolve(key, future) for key, future in batch.items()),
+                return_exceptions=True
+            )
+        finally:
+            # Never leave a waiter hanging if the batch itself was cancelled
+            for key, future in batch.items():
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+                if not future.done():
+                    future.cancel()
+    
+    async def _resolve(self, key: Tuple[str, int], future: asyncio.Future) -> None:
+        """Fetch one request and release its waiters as soon as it completes."""
+        try:
+            result = await self._fetch_one(*key)
+        except Exception:
+            result = None
+        
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.done():
+            future.set_result(result)
+    
+    def close(self) -> None:
+        """Drop queued requests and cancel batches in flight."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._inflight.clear()
+        
+        for task in self._batches:
+            task.cancel()
+
 class CCXTGenericConnector(AbstractExchangeConnector):
     """Generic connector using CCXT/CCXT.Pro for WebSocket and REST."""
     
@@ -33,9 +129,14 @@ class CCXTGenericConnector(AbstractExchangeConnector):
         super().__init__(exchange_name)
         self.ws_exchange: Optional[ccxtpro.Exchange] = None
         self.rest_exchange: Optional[ccxt.Exchange] = None
+        self.rest_exchange_async: Optional[ccxt_async.Exchange] = None
         self.supports_ws = False
         self.rate_limit_semaphore: Optional[asyncio.Semaphore] = None
-        self._last_rest_call: Dict[str, float] = {}
+        self.bucket: Optional[TokenBucket] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._rate_limit_s = 1.0
+        self._last_health_update = 0.0
+        self._batcher = BatchedOrderBookFetcher(self._fetch_raw_order_book)
         
     async def connect(self) -> bool:
         """Connect to the exchange with WebSocket preferred, REST fallback."""
@@ -46,11 +147,25 @@ class CCXTGenericConnector(AbstractExchangeConnector):
                 logger.error(f"Exchange {self.exchange_name} not found in registry")
                 return False
             
-            # Set up rate limiting
+            # Native asyncio REST client for order books; markets are shared with
+            # the registry's instance so it never has to load them itself, and
+            # pacing is left to our token bucket
+            if self.rest_exchange_async is None:
+                self.rest_exchange_async = getattr(ccxt_async, self.exchange_name)({
+                    'enableRateLimit': False,
+                    'timeout': 10000,
+                })
+                self.rest_exchange_async.set_markets(self.rest_exchange.markets, self.rest_exchange.currencies)
+            
+            # Set up rate limiting, reading the loop and the exchange's limit once
+            self._loop = asyncio.get_running_loop()
             rate_limit = getattr(self.rest_exchange, 'rateLimit', 1000)
+            self._rate_limit_s = rate_limit / 1000.0
             # Allow some concurrency but respect rate limits
             max_concurrent = max(1, min(10, 1000 // rate_limit))
             self.rate_limit_semaphore = asyncio.Semaphore(max_concurrent)
+            # One request per rateLimit ms across all symbols, bursting up to max_concurrent
+            self.bucket = TokenBucket(rate=1.0 / self._rate_limit_s, capacity=max_concurrent, clock=self._loop.time)
             
             # Try to set up WebSocket if supported
             if registry.has_websocket_support(self.exchange_name) and CCXT_PRO_AVAILABLE:
@@ -84,19 +199,26 @@ class CCXTGenericConnector(AbstractExchangeConnector):
     async def disconnect(self) -> None:
         """Disconnect from the exchange."""
         try:
+            self._batcher.close()
             if self.ws_exchange:
                 await self.ws_exchange.close()
-            # REST exchange is managed by registry
+            if self.rest_exchange_async:
+                await self.rest_exchange_async.close()
+                self.rest_exchange_async = None
+            # Synchronous REST exchange is managed by registry
             self.is_connected = False
             logger.info(f"Disconnected from {self.exchange_name}")
         except Exception as e:
             logger.debug(f"Error disconnecting from {self.exchange_name}: {e}")
     
-    async def watch_order_book(self, symbol: str, limit: int = 10) -> AsyncGenerator[OrderBook, None]:
+    async def watch_order_book(self, symbol: str, limit: int = 10,
+                               standard_symbol: Optional[str] = None) -> AsyncGenerator[OrderBook, None]:
         """Watch order book updates via WebSocket."""
         if not self.supports_ws or not self.ws_exchange:
             raise NotImplementedError(f"WebSocket not supported for {self.exchange_name}")
         
+        book_symbol = standard_symbol or symbol
+        clock = asyncio.get_running_loop().time
         retries = 0
         max_retries = 3
         
@@ -110,14 +232,19 @@ class CCXTGenericConnector(AbstractExchangeConnector):
                         raw_book = await self.ws_exchange.watch_order_book(symbol, limit)
                         
                         # Parse and yield order book
-                        order_book = self._parse_order_book_data(raw_book, symbol)
+                        order_book = self._parse_order_book_data(raw_book, book_symbol)
                         if order_book:
                             self.update_connection_stats()
-                            registry.update_health(
-                                self.exchange_name,
-                                ws_connected=True,
-                                last_ws_message=datetime.utcnow()
-                            )
+                            
+                            # Health only needs sub-second freshness, not one write per tick
+                            now = clock()
+                            if now - self._last_health_update > HEALTH_UPDATE_INTERVAL_S:
+                                self._last_health_update = now
+                                registry.update_health(
+                                    self.exchange_name,
+                                    ws_connected=True,
+                                    last_ws_message=datetime.utcnow()
+                                )
                             yield order_book
                         
                     except Exception as e:
@@ -135,7 +262,7 @@ class CCXTGenericConnector(AbstractExchangeConnector):
                 retries += 1
                 if retries < max_retries:
                     logger.info(f"Retrying WebSocket connection for {self.exchange_name} (attempt {retries + 1})")
-                    await asyncio.sleep(2 ** retries)  # Exponential backoff
+                    await asyncio.sleep(jittered_backoff(retries))
                 
             except Exception as e:
                 logger.error(f"Fatal error in WebSocket watch for {self.exchange_name}: {e}")
@@ -146,46 +273,64 @@ class CCXTGenericConnector(AbstractExchangeConnector):
         logger.error(f"Max retries exceeded for WebSocket on {self.exchange_name}")
         registry.update_health(self.exchange_name, ws_connected=False)
     
-    async def fetch_order_book(self, symbol: str, limit: int = 10) -> Optional[OrderBook]:
-        """Fetch order book snapshot via REST API with rate limiting."""
-        if not self.rest_exchange or not self.rate_limit_semaphore:
+    async def fetch_order_book(self, symbol: str, limit: int = 10,
+                               standard_symbol: Optional[str] = None) -> Optional[OrderBook]:
+        """Fetch order book snapshot via REST API with rate limiting.
+        
+        Requests are batched for a few milliseconds and concurrent requests for
+        the same (symbol, limit) share one REST call. Nothing is sent while the
+        circuit breaker is open.
+        """
+        if not self.rest_exchange_async or not self.bucket or not self.breaker.allow():
+            return None
+        
+        raw_book = await self._batcher.fetch(symbol, limit)
+        if raw_book is None:
             return None
         
-        async with self.rate_limit_semaphore:
+        # Parse order book
+        order_book = self._parse_order_book_data(raw_book, standard_symbol or symbol)
+        if order_book:
+            self.update_connection_stats()
+            registry.update_health(
+                self.exchange_name,
+                rest_ok=True,
+                last_rest_call=datetime.utcnow()
+            )
+        
+        return order_book
+    
+    async def _fetch_raw_order_book(self, symbol: str, limit: int) -> Optional[Dict[str, Any]]:
+        """Issue one rate-limited REST order book request.
+        
+        Args:
+            symbol: Exchange symbol
+            limit: Number of price levels to retrieve
+            
+        Returns:
+            Raw ccxt order book, or None if the request failed
+        """
+        semaphore = self.rate_limit_semaphore
+        bucket = self.bucket
+        exchange = self.rest_exchange_async
+        
+        # Not connected (or already disconnected)
+        if semaphore is None or bucket is None or exchange is None:
+            return None
+        
+        async with semaphore:
             try:
-                # Implement adaptive rate limiting
-                now = asyncio.get_event_loop().time()
-                last_call = self._last_rest_call.get(symbol, 0)
-                rate_limit_ms = getattr(self.rest_exchange, 'rateLimit', 1000)
-                min_interval = rate_limit_ms / 1000.0
-                
-                time_since_last = now - last_call
-                if time_since_last < min_interval:
-                    await asyncio.sleep(min_interval - time_since_last)
+                # Respect the exchange-wide request rate
+                await bucket.acquire()
                 
                 # Fetch order book
-                raw_book = await asyncio.to_thread(
-                    self.rest_exchange.fetch_order_book,
-                    symbol,
-                    limit
-                )
-                
-                self._last_rest_call[symbol] = asyncio.get_event_loop().time()
-                
-                # Parse order book
-                order_book = self._parse_order_book_data(raw_book, symbol)
-                if order_book:
-                    self.update_connection_stats()
-                    registry.update_health(
-                        self.exchange_name,
-                        rest_ok=True,
-                        last_rest_call=datetime.utcnow()
-                    )
-                
-                return order_book
+                raw_book: Dict[str, Any] = await exchange.fetch_order_book(symbol, limit)
+                self.breaker.record_success()
+                return raw_book
                 
             except Exception as e:
                 logger.debug(f"Error fetching order book for {symbol} on {self.exchange_name}: {e}")
+                self.breaker.record_failure()
                 self.update_connection_stats(error=True)
                 registry.update_health(self.exchange_name, rest_ok=False)
                 return None
@@ -198,6 +343,16 @@ class CCXTGenericConnector(AbstractExchangeConnector):
         """Check if WebSocket is supported and available."""
         return self.supports_ws and self.ws_exchange is not None
 
+def _create_cointr_connector(exchange_name: str) -> AbstractExchangeConnector:
+    """Create a CoinTR connector, importing its module on first use."""
+    from .cointr import CoinTRConnector
+    return CoinTRConnector(exchange_name)
+
+# Exchanges with a native connector, keyed by lowercase name; all others use CCXT
+_CONNECTOR_TABLE: Dict[str, Callable[[str], AbstractExchangeConnector]] = {
+    'cointr': _create_cointr_connector,
+}
+
 class ConnectorFactory:
     """Factory for creating exchange connectors."""
     
@@ -211,13 +366,8 @@ class ConnectorFactory:
         Returns:
             Exchange connector instance
         """
-        # Special handling for CoinTR
-        if exchange_name.lower() == 'cointr':
-            from .cointr import CoinTRConnector
-            return CoinTRConnector(exchange_name)
-        
-        # For all other exchanges, use the generic CCXT connector
-        return CCXTGenericConnector(exchange_name)
+        factory = _CONNECTOR_TABLE.get(exchange_name.lower(), CCXTGenericConnector)
+        return factory(exchange_name)
 
 # Convenience factory function
 def create_connector(exchange_name: str) -> AbstractExchangeConnector:
@@ -2,22 +2,44 @@
 
 import asyncio
 import logging
-import json
+import orjson
+import ssl
 import websockets
 import aiohttp
-from typing import AsyncGenerator, Optional, Dict, Any, List
-from datetime import datetime
-import sys
-from pathlib import Path
+from typing import AsyncGenerator, Optional, Dict, List
+import time
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from .base import AbstractExchangeConnector
-from models import OrderBook, DepthLevel, FeesPublic
+from .base import AbstractExchangeConnector, jittered_backoff
+from ._fastparse import parse_levels
+from models import OrderBook, FeesPublic
+from config import config
 
 logger = logging.getLogger(__name__)
 
+# REST connection pool limits; fetches beyond the per-host cap queue on a semaphore
+MAX_CONNECTIONS = 100
+MAX_CONNECTIONS_PER_HOST = 20
+
+# Largest WebSocket frame accepted; depth snapshots are far below this
+WS_MAX_FRAME_BYTES = 2 ** 20
+
+def _build_ssl_context() -> ssl.SSLContext:
+    """Build the TLS context shared by every CoinTR REST and WebSocket connection.
+    
+    Certificates are verified unless COINTR_INSECURE_SSL is set.
+    
+    Returns:
+        Client SSL context
+    """
+    context = ssl.create_default_context()
+    if config.COINTR_INSECURE_SSL:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+# Loaded once so reconnects do not re-read the CA bundle
+SSL_CONTEXT = _build_ssl_context()
+
 class CoinTRConnector(AbstractExchangeConnector):
     """CoinTR exchange connector using native WebSocket and REST APIs."""
     
@@ -30,17 +52,21 @@ class CoinTRConnector(AbstractExchangeConnector):
         self.ws_connection: Optional[websockets.WebSocketServerProtocol] = None
         self.symbol_subscriptions: Dict[str, bool] = {}
         self.supports_ws = True
+        self._rest_semaphore = asyncio.Semaphore(MAX_CONNECTIONS_PER_HOST)
+        self._sub_frames: Dict[str, str] = {}
         
     async def connect(self) -> bool:
         """Connect to CoinTR API."""
         try:
-            # Create HTTP session with SSL verification disabled for testing
-            import ssl
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
+            # One pooled keep-alive session shared by every REST call
+            connector = aiohttp.TCPConnector(
+                ssl=SSL_CONTEXT,
+                limit=MAX_CONNECTIONS,
+                limit_per_host=MAX_CONNECTIONS_PER_HOST,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True,
+                keepalive_timeout=75,
+            )
             self.session = aiohttp.ClientSession(connector=connector)
             
             # Test REST API connection
@@ -86,11 +112,34 @@ class CoinTRConnector(AbstractExchangeConnector):
             logger.error(f"Error getting symbols from CoinTR: {e}")
             return None
     
-    async def watch_order_book(self, symbol: str, limit: int = 10) -> AsyncGenerator[OrderBook, None]:
+    def _subscribe_frame(self, symbol: str) -> str:
+        """Get the serialized order book subscription for a symbol, built once per symbol.
+        
+        Args:
+            symbol: Exchange symbol
+            
+        Returns:
+            JSON text frame
+        """
+        frame = self._sub_frames.get(symbol)
+        if frame is None:
+            frame = self._sub_frames[symbol] = orjson.dumps({
+                "op": "subscribe",
+                "args": [{
+                    "instType": "SPOT",
+                    "channel": "books5",  # books5 = 5 depth levels
+                    "instId": symbol.upper()
+                }]
+            }).decode()  # Sent as a text frame
+        return frame
+    
+    async def watch_order_book(self, symbol: str, limit: int = 10,
+                               standard_symbol: Optional[str] = None) -> AsyncGenerator[OrderBook, None]:
         """Watch order book updates via WebSocket."""
         if not self.supports_ws:
             raise NotImplementedError(f"WebSocket not supported for {self.exchange_name}")
         
+        book_symbol = standard_symbol or symbol
         retries = 0
         max_retries = 3
         
@@ -99,25 +148,21 @@ class CoinTRConnector(AbstractExchangeConnector):
                 logger.debug(f"Starting WebSocket order book watch for {symbol} on {self.exchange_name}")
                 
                 # Connect to WebSocket
-                async with websockets.connect(self.ws_url) as websocket:
+                async with websockets.connect(
+                    self.ws_url,
+                    ssl=SSL_CONTEXT,
+                    compression=None,  # Skip per-message deflate; inflating every tick costs more than it saves
+                    max_size=WS_MAX_FRAME_BYTES,
+                ) as websocket:
                     self.ws_connection = websocket
                     
                     # Subscribe to order book - CoinTR depth channel format
-                    subscribe_msg = {
-                        "op": "subscribe",
-                        "args": [{
-                            "instType": "SPOT",
-                            "channel": "books5",  # books5 = 5 depth levels
-                            "instId": symbol.upper()
-                        }]
-                    }
-                    
-                    await websocket.send(json.dumps(subscribe_msg))
+                    await websocket.send(self._subscribe_frame(symbol))
                     
                     # Listen for messages
                     async for message in websocket:
                         try:
-                            data = json.loads(message)
+                            data = orjson.loads(message)  # Accepts str or bytes frames
                             
                             # Skip subscription confirmation and pong messages
                             if 'event' in data or 'pong' in data:
@@ -126,12 +171,12 @@ class CoinTRConnector(AbstractExchangeConnector):
                             # Parse order book data - CoinTR depth format
                             if ('data' in data and 'arg' in data and 
                                 data.get('arg', {}).get('channel') in ['books', 'books1', 'books5', 'books15']):
-                                order_book = self._parse_websocket_order_book(data, symbol)
+                                order_book = self._parse_websocket_order_book(data, book_symbol)
                                 if order_book:
                                     self.update_connection_stats()
                                     yield order_book
                                 
-                        except json.JSONDecodeError:
+                        except orjson.JSONDecodeError:
                             logger.warning(f"Invalid JSON from {self.exchange_name}: {message}")
                             continue
                         except Exception as e:
@@ -143,13 +188,14 @@ class CoinTRConnector(AbstractExchangeConnector):
                 retries += 1
                 if retries < max_retries:
                     logger.info(f"Retrying WebSocket connection (attempt {retries + 1})")
-                    await asyncio.sleep(2 ** retries)
+                    await asyncio.sleep(jittered_backoff(retries))
         
         logger.error(f"Max retries exceeded for WebSocket on {self.exchange_name}")
     
-    async def fetch_order_book(self, symbol: str, limit: int = 10) -> Optional[OrderBook]:
-        """Fetch order book snapshot via REST API."""
-        if not self.session:
+    async def fetch_order_book(self, symbol: str, limit: int = 10,
+                               standard_symbol: Optional[str] = None) -> Optional[OrderBook]:
+        """Fetch order book snapshot via REST API, unless the circuit breaker is open."""
+        if not self.session or not self.breaker.allow():
             return None
         
         try:
@@ -159,18 +205,23 @@ class CoinTRConnector(AbstractExchangeConnector):
                 'limit': limit
             }
             
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    if data.get('code') == '00000' and 'data' in data:
-                        order_book = self._parse_rest_order_book(data['data'], symbol)
-                        if order_book:
-                            self.update_connection_stats()
-                            return order_book
+            async with self._rest_semaphore, self.session.get(url, params=params) as response:
+                if response.status != 200:
+                    self.breaker.record_failure()
+                    return None
+                
+                self.breaker.record_success()
+                data = await response.json()
+                
+                if data.get('code') == '00000' and 'data' in data:
+                    order_book = self._parse_rest_order_book(data['data'], standard_symbol or symbol)
+                    if order_book:
+                        self.update_connection_stats()
+                        return order_book
                     
         except Exception as e:
             logger.debug(f"Error fetching order book for {symbol} on {self.exchange_name}: {e}")
+            self.breaker.record_failure()
             self.update_connection_stats(error=True)
         
         return None
@@ -184,28 +235,15 @@ class CoinTRConnector(AbstractExchangeConnector):
             book_data = data['data'][0]  # CoinTR sends array
             
             # Parse bids and asks
-            bids = []
-            for bid in book_data.get('bids', []):
-                if len(bid) >= 2:
-                    bids.append(DepthLevel(
-                        price=float(bid[0]),
-                        amount=float(bid[1])  # Changed from 'size' to 'amount'
-                    ))
-            
-            asks = []
-            for ask in book_data.get('asks', []):
-                if len(ask) >= 2:
-                    asks.append(DepthLevel(
-                        price=float(ask[0]),
-                        amount=float(ask[1])  # Changed from 'size' to 'amount'
-                    ))
+            bids = parse_levels(book_data.get('bids') or [], descending=True)
+            asks = parse_levels(book_data.get('asks') or [])
             
             return OrderBook(
                 exchange=self.exchange_name,
                 symbol=symbol,
                 bids=bids,
                 asks=asks,
-                timestamp=datetime.utcnow()
+                timestamp_ns=time.time_ns()
             )
             
         except Exception as e:
@@ -216,28 +254,15 @@ class CoinTRConnector(AbstractExchangeConnector):
         """Parse REST API order book data."""
         try:
             # Parse bids and asks
-            bids = []
-            for bid in data.get('bids', []):
-                if len(bid) >= 2:
-                    bids.append(DepthLevel(
-                        price=float(bid[0]),
-                        amount=float(bid[1])  # Changed from 'size' to 'amount'
-                    ))
-            
-            asks = []
-            for ask in data.get('asks', []):
-                if len(ask) >= 2:
-                    asks.append(DepthLevel(
-                        price=float(ask[0]),
-                        amount=float(ask[1])  # Changed from 'size' to 'amount'
-                    ))
+            bids = parse_levels(data.get('bids') or [], descending=True)
+            asks = parse_levels(data.get('asks') or [])
             
             return OrderBook(
                 exchange=self.exchange_name,
                 symbol=symbol,
                 bids=bids,
                 asks=asks,
-                timestamp=datetime.utcnow()
+                timestamp_ns=time.time_ns()
             )
             
         except Exception as e:
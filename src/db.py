@@ -4,7 +4,8 @@ import asyncio
 import logging
 import aiosqlite
 import orjson
-from typing import List, Optional, Dict, Any
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Dict, Any
 from datetime import datetime, timedelta
 
 from models import Opportunity, TriOpportunity, ExchangeHealth
@@ -12,30 +13,135 @@ from config import config
 
 logger = logging.getLogger(__name__)
 
+# Connections reserved for queries so reads never wait behind the batched writer
+READ_POOL_SIZE = 4
+
+# Applied to every connection: WAL lets readers run alongside the writer and
+# synchronous=NORMAL drops the per-commit fsync (still durable at checkpoints)
+CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-65536;
+    PRAGMA busy_timeout=5000;
+"""
+
+# Old rows are deleted this many at a time, pausing between chunks
+CLEANUP_CHUNK_ROWS = 5000
+CLEANUP_PAUSE_S = 0.05
+
+# On-disk schema version, tracked in PRAGMA user_version
+# 1: time columns hold INTEGER epoch microseconds instead of datetime text
+SCHEMA_VERSION = 1
+
+# Time columns converted by the version 1 migration. created_at stays TEXT: SQLite
+# fills it from its CURRENT_TIMESTAMP default, nothing reads it, and changing the
+# default of an existing column would mean rebuilding every table
+_TIME_COLUMNS = {
+    'opportunities': ('timestamp',),
+    'tri_opportunities': ('timestamp',),
+    'exchange_health': ('timestamp', 'last_ws_message', 'last_rest_call'),
+}
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+def to_epoch_us(value: Optional[datetime]) -> Optional[int]:
+    """Convert a naive UTC datetime to integer microseconds since the epoch.
+    
+    Args:
+        value: Naive UTC datetime, or None
+        
+    Returns:
+        Epoch microseconds as stored in the time columns, or None
+    """
+    if value is None:
+        return None
+    return (value - _EPOCH) // _ONE_MICROSECOND
+
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Minimum seconds between WAL checkpoints, run after a batch is written
+CHECKPOINT_INTERVAL_S = 60.0
+
+INSERT_OPPORTUNITY_SQL = """
+    INSERT INTO opportunities (
+        type, symbol, buy_exchange, sell_exchange,
+        buy_price_before_fees, sell_price_before_fees,
+        buy_price_after_fees, sell_price_after_fees,
+        spread_bps, notional, buy_depth_levels, sell_depth_levels,
+        buy_fees_maker, buy_fees_taker, sell_fees_maker, sell_fees_taker,
+        mode, timestamp
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_TRI_OPPORTUNITY_SQL = """
+    INSERT INTO tri_opportunities (
+        type, exchange, base_asset, path_asset1, path_asset2, path_asset3,
+        start_amount, end_amount, gain_bps, notional,
+        leg1_symbol, leg1_price, leg1_side,
+        leg2_symbol, leg2_price, leg2_side,
+        leg3_symbol, leg3_price, leg3_side,
+        fees_maker, fees_taker, timestamp
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def _json_each_variant(insert_sql: str) -> str:
+    """Rewrite an INSERT ... VALUES (?, ...) statement to read its rows from json_each.
+    
+    The rewritten statement takes one parameter: a JSON array of row arrays
+    with the columns in the same order as the original placeholders.
+    """
+    head, values = insert_sql.split("VALUES")
+    columns = ", ".join(f"json_extract(value, '$[{i}]')" for i in range(values.count("?")))
+    return f"{head}SELECT {columns} FROM json_each(?)\n"
+
+INSERT_OPPORTUNITY_JSON_SQL = _json_each_variant(INSERT_OPPORTUNITY_SQL)
+INSERT_TRI_OPPORTUNITY_JSON_SQL = _json_each_variant(INSERT_TRI_OPPORTUNITY_SQL)
+
+# Above this many rows a table's batch is bound as one JSON payload and unpacked
+# by SQLite, instead of binding every column of every row through executemany
+JSON_INSERT_MIN_ROWS = 50
+
+INSERT_HEALTH_SQL = """
+    INSERT INTO exchange_health (
+        exchange, ws_connected, rest_ok, last_ws_message, last_rest_call,
+        reconnect_count, error_rate, queue_length, coalesced_updates,
+        event_loop_lag_ms, symbols_subscribed, timestamp
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 class DatabaseManager:
     """Manages SQLite database operations."""
     
     def __init__(self, db_path: str = None):
         self.db_path = db_path or config.DB_PATH
-        self.db: Optional[aiosqlite.Connection] = None
+        self.db: Optional[aiosqlite.Connection] = None  # Dedicated writer connection
+        self.read_pool: Optional[asyncio.Queue] = None
         self.write_queue = asyncio.Queue()
         self.write_task: Optional[asyncio.Task] = None
-        self.batch_size = 10
-        self.flush_interval = 5.0  # seconds
+        self.batch_size = 500  # Max rows per transaction
         
     async def initialize(self) -> None:
         """Initialize database and create tables."""
         try:
-            self.db = await aiosqlite.connect(self.db_path)
+            self.db = await self._connect()
             await self._create_tables()
             
+            # Open reader connections once the schema exists
+            self.read_pool = asyncio.Queue()
+            for _ in range(READ_POOL_SIZE):
+                self.read_pool.put_nowait(await self._connect())
+            
             # Start the write queue processor
             self.write_task = asyncio.create_task(self._process_write_queue())
             
-            logger.info(f"Database initialized: {self.db_path}")
+            logger.info("Database initialized: %s", self.db_path)
             
         except Exception as e:
-            logger.error(f"Failed to initialize database: {e}")
+            logger.error("Failed to initialize database: %s", e)
             raise
     
     async def close(self) -> None:
@@ -47,10 +153,39 @@ class DatabaseManager:
             except asyncio.CancelledError:
                 pass
         
+        if self.read_pool:
+            while not self.read_pool.empty():
+                await self.read_pool.get_nowait().close()
+            self.read_pool = None
+        
         if self.db:
+            # Let SQLite refresh statistics for the queries this session ran
+            try:
+                await self.db.execute("PRAGMA optimize")
+            except Exception as e:
+                logger.debug("PRAGMA optimize failed: %s", e)
             await self.db.close()
             logger.info("Database connection closed")
     
+    async def _connect(self) -> aiosqlite.Connection:
+        """Open a new connection to the database file with the tuning pragmas applied.
+        
+        Returns:
+            Open aiosqlite connection
+        """
+        conn = await aiosqlite.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
+        await conn.executescript(CONNECTION_PRAGMAS)
+        return conn
+    
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a read connection from the pool, waiting if all are in use."""
+        conn = await self.read_pool.get()
+        try:
+            yield conn
+        finally:
+            self.read_pool.put_nowait(conn)
+    
     async def _create_tables(self) -> None:
         """Create database tables."""
         
@@ -75,7 +210,7 @@ class DatabaseManager:
                 sell_fees_maker REAL,
                 sell_fees_taker REAL,
                 mode TEXT,
-                timestamp DATETIME NOT NULL,
+                timestamp INTEGER NOT NULL,  -- epoch microseconds
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         """)
@@ -105,7 +240,7 @@ class DatabaseManager:
                 leg3_side TEXT NOT NULL,
                 fees_maker REAL NOT NULL,
                 fees_taker REAL NOT NULL,
-                timestamp DATETIME NOT NULL,
+                timestamp INTEGER NOT NULL,  -- epoch microseconds
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         """)
@@ -115,43 +250,81 @@ class DatabaseManager:
             CREATE TABLE IF NOT EXISTS exchange_health (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 exchange TEXT NOT NULL,
-                ws_connected INTEGER NOT NULL,
-                rest_ok INTEGER NOT NULL,
-                last_ws_message DATETIME,
-                last_rest_call DATETIME,
+                ws_connected INTEGER NOT NULL CHECK (ws_connected IN (0, 1)),
+                rest_ok INTEGER NOT NULL CHECK (rest_ok IN (0, 1)),
+                last_ws_message INTEGER,  -- epoch microseconds
+                last_rest_call INTEGER,  -- epoch microseconds
                 reconnect_count INTEGER DEFAULT 0,
                 error_rate REAL DEFAULT 0.0,
                 queue_length INTEGER DEFAULT 0,
                 coalesced_updates INTEGER DEFAULT 0,
                 event_loop_lag_ms REAL DEFAULT 0.0,
-                symbols_subscribed TEXT,
-                timestamp DATETIME NOT NULL,
+                symbols_subscribed BLOB,
+                timestamp INTEGER NOT NULL,  -- epoch microseconds
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         """)
         
         # Create indexes for better query performance
+        await self._migrate_schema()
+        
         await self.db.execute("""
             CREATE INDEX IF NOT EXISTS idx_opportunities_timestamp 
             ON opportunities(timestamp)
         """)
         
+        # Symbol- and exchange-scoped lookups newest first; the composite index
+        # also covers plain symbol lookups, so the old single-column one goes
         await self.db.execute("""
-            CREATE INDEX IF NOT EXISTS idx_opportunities_symbol 
-            ON opportunities(symbol)
+            CREATE INDEX IF NOT EXISTS idx_opportunities_symbol_timestamp 
+            ON opportunities(symbol, timestamp DESC)
         """)
         
+        await self.db.execute("DROP INDEX IF EXISTS idx_opportunities_symbol")
+        
         await self.db.execute("""
             CREATE INDEX IF NOT EXISTS idx_tri_opportunities_timestamp 
             ON tri_opportunities(timestamp)
         """)
         
+        await self.db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tri_opportunities_exchange_timestamp 
+            ON tri_opportunities(exchange, timestamp DESC)
+        """)
+        
         await self.db.execute("""
             CREATE INDEX IF NOT EXISTS idx_exchange_health_timestamp 
             ON exchange_health(timestamp)
         """)
         
         await self.db.commit()
+        
+        # Refresh planner statistics so the new indexes are used
+        await self.db.execute("ANALYZE")
+    
+    async def _migrate_schema(self) -> None:
+        """Bring a database created by an older version up to SCHEMA_VERSION."""
+        cursor = await self.db.execute("PRAGMA user_version")
+        (version,) = await cursor.fetchone()
+        
+        if version < 1:
+            # Datetime text ('YYYY-MM-DD HH:MM:SS[.ffffff]') to epoch microseconds: whole
+            # seconds from strftime, plus the fractional digits taken verbatim (julianday
+            # would round through a double and lose the microseconds)
+            for table, columns in _TIME_COLUMNS.items():
+                for column in columns:
+                    await self.db.execute(f"""
+                        UPDATE {table}
+                        SET {column} = CAST(strftime('%s', {column}) AS INTEGER) * 1000000
+                            + CASE WHEN instr({column}, '.') > 0
+                                THEN CAST(substr(substr({column}, instr({column}, '.') + 1) || '000000', 1, 6) AS INTEGER)
+                                ELSE 0 END
+                        WHERE typeof({column}) = 'text'
+                    """)
+        
+        if version < SCHEMA_VERSION:
+            await self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            await self.db.commit()
     
     async def store_opportunity(self, opportunity: Opportunity) -> None:
         """Store cross-exchange opportunity (queued for batch processing).
@@ -169,50 +342,74 @@ class DatabaseManager:
         """
         await self.write_queue.put(('tri_opportunity', opportunity))
     
+    async def store_opportunities_bulk(self, opportunities: List[Opportunity]) -> None:
+        """Store several cross-exchange opportunities (queued for batch processing).
+        
+        Args:
+            opportunities: Opportunities to store
+        """
+        for opportunity in opportunities:
+            self.write_queue.put_nowait(('opportunity', opportunity))
+    
+    async def store_tri_opportunities_bulk(self, opportunities: List[TriOpportunity]) -> None:
+        """Store several triangular opportunities (queued for batch processing).
+        
+        Args:
+            opportunities: Triangular opportunities to store
+        """
+        for opportunity in opportunities:
+            self.write_queue.put_nowait(('tri_opportunity', opportunity))
+    
     async def store_health_snapshot(self, health: ExchangeHealth) -> None:
         """Store exchange health snapshot (queued for batch processing).
         
+        The row is built here rather than at flush time: it is a true snapshot
+        even though the registry keeps mutating the same ExchangeHealth object.
+        
         Args:
             health: Health snapshot to store
         """
-        await self.write_queue.put(('health', health))
+        await self.write_queue.put(('health', self._health_row(health)))
     
     async def _process_write_queue(self) -> None:
-        """Process write queue with batching."""
+        """Process write queue with batching.
+        
+        Waits for one item, then drains whatever else is already queued (up to
+        batch_size) without yielding and writes it all as one batch. Items that
+        arrive during a write are picked up by the next drain.
+        """
         batch = []
-        last_flush = datetime.utcnow()
+        clock = asyncio.get_running_loop().time  # Monotonic; no datetime per batch
+        last_checkpoint = clock()
         
         while True:
             try:
-                # Get item with timeout for periodic flushing
-                try:
-                    item = await asyncio.wait_for(
-                        self.write_queue.get(), 
-                        timeout=self.flush_interval
-                    )
-                    batch.append(item)
-                except asyncio.TimeoutError:
-                    # Timeout - flush any pending items
-                    pass
+                batch.append(await self.write_queue.get())
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.write_queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
                 
-                now = datetime.utcnow()
-                should_flush = (
-                    len(batch) >= self.batch_size or
-                    (batch and (now - last_flush).total_seconds() >= self.flush_interval)
-                )
+                await self._flush_batch(batch)
+                batch.clear()
                 
-                if should_flush and batch:
-                    await self._flush_batch(batch)
-                    batch.clear()
-                    last_flush = now
+                # Checkpoint now and then so the WAL does not grow unbounded
+                now = clock()
+                if now - last_checkpoint >= CHECKPOINT_INTERVAL_S:
+                    await self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                    last_checkpoint = now
                 
             except asyncio.CancelledError:
-                # Flush remaining items before cancellation
+                # Flush everything still queued before cancellation
+                while not self.write_queue.empty():
+                    batch.append(self.write_queue.get_nowait())
                 if batch:
                     await self._flush_batch(batch)
                 break
             except Exception as e:
-                logger.error(f"Error in write queue processor: {e}")
+                batch.clear()
+                logger.error("Error in write queue processor: %s", e)
                 await asyncio.sleep(1)
     
     async def _flush_batch(self, batch: List[tuple]) -> None:
@@ -225,137 +422,151 @@ class DatabaseManager:
             return
         
         try:
+            # Group rows per table so each table takes one executemany
+            opportunity_rows = []
+            tri_rows = []
+            health_rows = []
+            
             for item_type, obj in batch:
                 if item_type == 'opportunity':
-                    await self._insert_opportunity(obj)
+                    opportunity_rows.append(self._opportunity_row(obj))
                 elif item_type == 'tri_opportunity':
-                    await self._insert_tri_opportunity(obj)
+                    tri_rows.append(self._tri_opportunity_row(obj))
                 elif item_type == 'health':
-                    await self._insert_health(obj)
+                    health_rows.append(obj)  # Row already built when queued
+            
+            # Take the write lock up front so the whole batch is one transaction
+            await self.db.execute("BEGIN IMMEDIATE")
+            if opportunity_rows:
+                await self._insert_rows(INSERT_OPPORTUNITY_SQL, INSERT_OPPORTUNITY_JSON_SQL, opportunity_rows)
+            if tri_rows:
+                await self._insert_rows(INSERT_TRI_OPPORTUNITY_SQL, INSERT_TRI_OPPORTUNITY_JSON_SQL, tri_rows)
+            if health_rows:
+                await self.db.executemany(INSERT_HEALTH_SQL, health_rows)
             
             await self.db.commit()
-            logger.debug(f"Flushed batch of {len(batch)} items to database")
+            logger.debug("Flushed batch of %d items to database", len(batch))
             
         except Exception as e:
-            logger.error(f"Error flushing batch to database: {e}")
-            try:
+            logger.error("Error flushing batch to database: %s", e)
+            if self.db.in_transaction:
                 await self.db.rollback()
-            except Exception:
-                pass
     
-    async def _insert_opportunity(self, opp: Opportunity) -> None:
-        """Insert cross-exchange opportunity into database."""
-        await self.db.execute("""
-            INSERT INTO opportunities (
-                type, symbol, buy_exchange, sell_exchange,
-                buy_price_before_fees, sell_price_before_fees,
-                buy_price_after_fees, sell_price_after_fees,
-                spread_bps, notional, buy_depth_levels, sell_depth_levels,
-                buy_fees_maker, buy_fees_taker, sell_fees_maker, sell_fees_taker,
-                mode, timestamp
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+    async def _insert_rows(self, sql: str, json_sql: str, rows: List[tuple]) -> None:
+        """Insert rows with executemany, or through json_each for large batches.
+        
+        Args:
+            sql: INSERT ... VALUES statement for one row
+            json_sql: Equivalent statement reading a JSON array of rows
+            rows: Row tuples in column order
+        """
+        if len(rows) <= JSON_INSERT_MIN_ROWS:
+            await self.db.executemany(sql, rows)
+            return
+        
+        payload = orjson.dumps(rows, option=orjson.OPT_SERIALIZE_NUMPY)
+        # JSON functions only accept text, so bind as str rather than bytes
+        await self.db.execute(json_sql, (payload.decode(),))
+    
+    @staticmethod
+    def _opportunity_row(opp: Opportunity) -> tuple:
+        """Build the opportunities row for a cross-exchange opportunity."""
+        return (
             opp.type, opp.symbol, opp.buy_exchange, opp.sell_exchange,
             opp.buy_price_before_fees, opp.sell_price_before_fees,
             opp.buy_price_after_fees, opp.sell_price_after_fees,
             opp.spread_bps, opp.notional, opp.buy_depth_levels, opp.sell_depth_levels,
             opp.buy_fees[0], opp.buy_fees[1], opp.sell_fees[0], opp.sell_fees[1],
-            opp.mode, opp.timestamp
-        ))
+            opp.mode, to_epoch_us(opp.timestamp)
+        )
     
-    async def _insert_tri_opportunity(self, opp: TriOpportunity) -> None:
-        """Insert triangular opportunity into database."""
-        await self.db.execute("""
-            INSERT INTO tri_opportunities (
-                type, exchange, base_asset, path_asset1, path_asset2, path_asset3,
-                start_amount, end_amount, gain_bps, notional,
-                leg1_symbol, leg1_price, leg1_side,
-                leg2_symbol, leg2_price, leg2_side,
-                leg3_symbol, leg3_price, leg3_side,
-                fees_maker, fees_taker, timestamp
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+    @staticmethod
+    def _tri_opportunity_row(opp: TriOpportunity) -> tuple:
+        """Build the tri_opportunities row for a triangular opportunity."""
+        return (
             opp.type, opp.exchange, opp.base_asset,
             opp.path[0], opp.path[1], opp.path[2],
             opp.start_amount, opp.end_amount, opp.gain_bps, opp.notional,
             opp.leg1_symbol, opp.leg1_price, opp.leg1_side,
             opp.leg2_symbol, opp.leg2_price, opp.leg2_side,
             opp.leg3_symbol, opp.leg3_price, opp.leg3_side,
-            opp.fees[0], opp.fees[1], opp.timestamp
-        ))
+            opp.fees[0], opp.fees[1], to_epoch_us(opp.timestamp)
+        )
     
-    async def _insert_health(self, health: ExchangeHealth) -> None:
-        """Insert health snapshot into database."""
-        symbols_json = orjson.dumps(health.symbols_subscribed).decode()
+    @staticmethod
+    def _health_row(health: ExchangeHealth) -> tuple:
+        """Build the exchange_health row for a health snapshot."""
+        # JSON bytes bound as a BLOB, no decode to str
+        symbols_json = orjson.dumps(health.symbols_subscribed)
         
-        await self.db.execute("""
-            INSERT INTO exchange_health (
-                exchange, ws_connected, rest_ok, last_ws_message, last_rest_call,
-                reconnect_count, error_rate, queue_length, coalesced_updates,
-                event_loop_lag_ms, symbols_subscribed, timestamp
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        return (
             health.exchange, int(health.ws_connected), int(health.rest_ok),
-            health.last_ws_message, health.last_rest_call, health.reconnect_count,
+            to_epoch_us(health.last_ws_message), to_epoch_us(health.last_rest_call), health.reconnect_count,
             health.error_rate, health.queue_length, health.coalesced_updates,
-            health.event_loop_lag_ms, symbols_json, health.last_updated
-        ))
+            health.event_loop_lag_ms, symbols_json, to_epoch_us(health.last_updated)
+        )
     
-    async def get_recent_opportunities(self, hours: int = 24) -> List[Dict[str, Any]]:
-        """Get recent opportunities from database.
+    async def get_recent_opportunities(self, hours: int = 24, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Get recent opportunities from database, newest first.
         
         Args:
             hours: Number of hours to look back
+            limit: Maximum number of rows to return
             
         Returns:
             List of opportunity dictionaries
         """
-        if not self.db:
-            return []
-        
-        cutoff = datetime.utcnow() - timedelta(hours=hours)
-        
-        cursor = await self.db.execute("""
-            SELECT * FROM opportunities 
-            WHERE timestamp >= ? 
-            ORDER BY timestamp DESC 
-            LIMIT 1000
-        """, (cutoff,))
-        
-        rows = await cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
-        
-        return [dict(zip(columns, row)) for row in rows]
+        return await self._fetch_recent("opportunities", hours, limit)
     
-    async def get_recent_tri_opportunities(self, hours: int = 24) -> List[Dict[str, Any]]:
-        """Get recent triangular opportunities from database.
+    async def get_recent_tri_opportunities(self, hours: int = 24, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Get recent triangular opportunities from database, newest first.
         
         Args:
             hours: Number of hours to look back
+            limit: Maximum number of rows to return
             
         Returns:
             List of triangular opportunity dictionaries
         """
-        if not self.db:
-            return []
+        return await self._fetch_recent("tri_opportunities", hours, limit)
+    
+    async def _fetch_recent(self, table: str, hours: int, limit: int) -> List[Dict[str, Any]]:
+        """Read the newest rows of a table within a time window.
         
-        cutoff = datetime.utcnow() - timedelta(hours=hours)
+        Rows are streamed from the cursor in chunks and turned into dicts one
+        at a time, so the full tuple list is never held alongside the dicts.
         
-        cursor = await self.db.execute("""
-            SELECT * FROM tri_opportunities 
-            WHERE timestamp >= ? 
-            ORDER BY timestamp DESC 
-            LIMIT 1000
-        """, (cutoff,))
+        Args:
+            table: Table to read (internal table name, not user input)
+            hours: Number of hours to look back
+            limit: Maximum number of rows to return
+            
+        Returns:
+            List of row dictionaries
+        """
+        if not self.read_pool:
+            return []
         
-        rows = await cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
+        cutoff = to_epoch_us(datetime.utcnow() - timedelta(hours=hours))
         
-        return [dict(zip(columns, row)) for row in rows]
+        async with self._reader() as conn:
+            cursor = await conn.execute(f"""
+                SELECT * FROM {table} 
+                WHERE timestamp >= ? 
+                ORDER BY timestamp DESC 
+                LIMIT ?
+            """, (cutoff, limit))
+            
+            columns = [desc[0] for desc in cursor.description]
+            return [dict(zip(columns, row)) async for row in cursor]
     
     async def cleanup_old_data(self, days: int = 7) -> int:
         """Clean up old data from database.
         
+        Rows are deleted in chunks, each in its own transaction on a separate
+        connection, so the batched writer and readers get in between chunks
+        and the WAL can be checkpointed as the cleanup goes.
+        
         Args:
             days: Number of days to keep
             
@@ -365,33 +576,53 @@ class DatabaseManager:
         if not self.db:
             return 0
         
-        cutoff = datetime.utcnow() - timedelta(days=days)
-        
-        # Delete old opportunities
-        cursor = await self.db.execute("""
-            DELETE FROM opportunities WHERE timestamp < ?
-        """, (cutoff,))
-        opp_deleted = cursor.rowcount
-        
-        # Delete old triangular opportunities
-        cursor = await self.db.execute("""
-            DELETE FROM tri_opportunities WHERE timestamp < ?
-        """, (cutoff,))
-        tri_deleted = cursor.rowcount
+        cutoff = to_epoch_us(datetime.utcnow() - timedelta(days=days))
+        # Health data is kept for only 24 hours
+        health_cutoff = to_epoch_us(datetime.utcnow() - timedelta(hours=24))
         
-        # Delete old health data (keep only 24 hours)
-        health_cutoff = datetime.utcnow() - timedelta(hours=24)
-        cursor = await self.db.execute("""
-            DELETE FROM exchange_health WHERE timestamp < ?
-        """, (health_cutoff,))
-        health_deleted = cursor.rowcount
+        conn = await self._connect()
+        try:
+            total_deleted = 0
+            for table, table_cutoff in (
+                ('opportunities', cutoff),
+                ('tri_opportunities', cutoff),
+                ('exchange_health', health_cutoff),
+            ):
+                total_deleted += await self._delete_in_chunks(conn, table, table_cutoff)
+        finally:
+            await conn.close()
+        
+        logger.info("Cleaned up %d old records from database", total_deleted)
         
-        await self.db.commit()
+        return total_deleted
+    
+    @staticmethod
+    async def _delete_in_chunks(conn: aiosqlite.Connection, table: str, cutoff: int) -> int:
+        """Delete rows older than cutoff, CLEANUP_CHUNK_ROWS per transaction.
         
-        total_deleted = opp_deleted + tri_deleted + health_deleted
-        logger.info(f"Cleaned up {total_deleted} old records from database")
+        Args:
+            conn: Connection to delete on
+            table: Table to clean (internal table name, not user input)
+            cutoff: Rows with an earlier timestamp (epoch microseconds) are deleted
+            
+        Returns:
+            Number of rows deleted
+        """
+        deleted = 0
         
-        return total_deleted
+        while True:
+            cursor = await conn.execute(f"""
+                DELETE FROM {table} WHERE rowid IN (
+                    SELECT rowid FROM {table} WHERE timestamp < ? LIMIT {CLEANUP_CHUNK_ROWS}
+                )
+            """, (cutoff,))
+            await conn.commit()
+            deleted += cursor.rowcount
+            
+            if cursor.rowcount < CLEANUP_CHUNK_ROWS:
+                return deleted
+            
+            await asyncio.sleep(CLEANUP_PAUSE_S)
     
     def get_stats(self) -> Dict[str, any]:
         """Get database statistics.
@@ -402,9 +633,9 @@ class DatabaseManager:
         return {
             'db_path': self.db_path,
             'connected': self.db is not None,
+            'read_connections': READ_POOL_SIZE if self.read_pool else 0,
             'write_queue_size': self.write_queue.qsize(),
-            'batch_size': self.batch_size,
-            'flush_interval_seconds': self.flush_interval
+            'batch_size': self.batch_size
         }
 
 # Global database manager instance
@@ -1,22 +1,106 @@
 """VWAP calculation for order book depth analysis."""
 
 import numpy as np
-from typing import List, Tuple, Optional
-from models import DepthLevel, VWAPResult
+from typing import Tuple, Sequence, Union
+from models import DepthArrays, DepthLevel, VWAPResult, as_depth_arrays
 
-def calculate_vwap(levels: List[DepthLevel], target_notional: float, 
+# Try to import numba to compile the VWAP walk for small books
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Cached depth arrays (OrderBook.bid_depth/ask_depth), an (N, 2) [price, amount]
+# array as stored on OrderBook, or DepthLevel objects
+Levels = Union[DepthArrays, np.ndarray, Sequence[DepthLevel]]
+
+def _vwap_walk(prices: np.ndarray, amounts: np.ndarray,
+               target: float) -> Tuple[float, float, int, bool]:
+    """Walk the levels once, accumulating notional until the target is filled.
+    
+    For the 5-25 level books seen in practice a single compiled loop is
+    cheaper than the NumPy calls it replaces; compiled with numba when it
+    is available.
+    
+    Returns:
+        Tuple of (vwap, volume, levels_used, fully_filled)
+    """
+    acc_notional = 0.0
+    acc_amount = 0.0
+    
+    for i in range(prices.shape[0]):
+        notional = prices[i] * amounts[i]
+        if acc_notional + notional >= target:
+            if i == 0:
+                return prices[0], target / prices[0], 1, True
+            
+            # Partial fill of this level
+            partial = (target - acc_notional) / prices[i]
+            volume = acc_amount + partial
+            vwap = (acc_notional + prices[i] * partial) / volume if volume > 0 else 0.0
+            return vwap, volume, i + 1, True
+        
+        acc_notional += notional
+        acc_amount += amounts[i]
+    
+    vwap = acc_notional / acc_amount if acc_amount > 0 else 0.0
+    return vwap, acc_amount, prices.shape[0], False
+
+def _vwap_searchsorted(depth: DepthArrays, target: float) -> Tuple[float, float, int, bool]:
+    """Find the fill level by binary search over the cached cumulative sums.
+    
+    Returns:
+        Tuple of (vwap, volume, levels_used, fully_filled)
+    """
+    prices = depth.prices
+    cumulative_notionals = depth.cum_notional
+    cumulative_amounts = depth.cum_amount
+    
+    # First level at which the target notional is reached (cumulative sums are non-decreasing)
+    fill_index = int(np.searchsorted(cumulative_notionals, target, side='left'))
+    
+    if fill_index == len(depth):
+        # Cannot fully fill - use all available liquidity
+        total_notional = cumulative_notionals[-1]
+        total_amount = cumulative_amounts[-1]
+        vwap = total_notional / total_amount if total_amount > 0 else 0.0
+        return float(vwap), float(total_amount), len(depth), False
+    
+    if fill_index == 0:
+        price = float(prices[0])
+        return price, target / price, 1, True
+    
+    # Multiple levels are needed - calculate partial fill of last level
+    full_levels_notional = cumulative_notionals[fill_index - 1]
+    remaining_notional = target - full_levels_notional
+    
+    last_level_price = prices[fill_index]
+    partial_amount = remaining_notional / last_level_price
+    
+    # Calculate VWAP for the filled portion; the full levels contribute their cumulative notional
+    total_amount_filled = cumulative_amounts[fill_index - 1] + partial_amount
+    total_weighted = full_levels_notional + last_level_price * partial_amount
+    
+    vwap = total_weighted / total_amount_filled if total_amount_filled > 0 else 0.0
+    return float(vwap), float(total_amount_filled), fill_index + 1, True
+
+if NUMBA_AVAILABLE:
+    _vwap_kernel = njit(cache=True)(_vwap_walk)
+
+def calculate_vwap(levels: Levels, target_notional: float, 
                   side: str = 'buy') -> VWAPResult:
     """Calculate Volume Weighted Average Price for a target notional amount.
     
     Args:
-        levels: List of order book levels (bids for buy, asks for sell)
+        levels: Order book levels (bids for buy, asks for sell)
         target_notional: Target notional amount to fill
         side: 'buy' or 'sell'
         
     Returns:
         VWAPResult with calculated VWAP and fill information
     """
-    if not levels or target_notional <= 0:
+    if len(levels) == 0 or target_notional <= 0:
         return VWAPResult(
             vwap_price=0.0,
             total_volume=0.0,
@@ -24,80 +108,37 @@ def calculate_vwap(levels: List[DepthLevel], target_notional: float,
             fully_filled=False
         )
     
-    # Convert to numpy arrays for vectorized operations
-    prices = np.array([level.price for level in levels])
-    amounts = np.array([level.amount for level in levels])
-    
-    # Calculate cumulative notional values
-    notionals = prices * amounts
-    cumulative_notionals = np.cumsum(notionals)
-    cumulative_amounts = np.cumsum(amounts)
-    
-    # Find where we can fill the target notional
-    fill_indices = np.where(cumulative_notionals >= target_notional)[0]
-    
-    if len(fill_indices) == 0:
-        # Cannot fully fill - use all available liquidity
-        total_notional = cumulative_notionals[-1]
-        total_amount = cumulative_amounts[-1]
-        vwap = total_notional / total_amount if total_amount > 0 else 0.0
-        
-        return VWAPResult(
-            vwap_price=vwap,
-            total_volume=total_amount,
-            levels_used=len(levels),
-            fully_filled=False
-        )
-    
-    # We can fill the order
-    fill_index = fill_indices[0]
+    # Price/amount columns with cumulative sums, reused when already cached on the book
+    depth = as_depth_arrays(levels)
     
-    if fill_index == 0:
-        # Target can be filled within first level
-        price = prices[0]
-        amount_needed = target_notional / price
+    # Fast path: the best level alone covers the target, common for small notionals
+    if depth.cum_notional[0] >= target_notional:
+        price = float(depth.prices[0])
         
         return VWAPResult(
             vwap_price=price,
-            total_volume=amount_needed,
+            total_volume=target_notional / price,
             levels_used=1,
             fully_filled=True
         )
     
-    # Need multiple levels - calculate partial fill of last level
-    full_levels_notional = cumulative_notionals[fill_index - 1]
-    remaining_notional = target_notional - full_levels_notional
-    
-    last_level_price = prices[fill_index]
-    partial_amount = remaining_notional / last_level_price
-    
-    # Calculate VWAP for the filled portion
-    total_amount_filled = cumulative_amounts[fill_index - 1] + partial_amount
-    
-    # Weighted average calculation
-    if fill_index > 0:
-        # Full levels contribution
-        full_levels_weighted = np.sum(prices[:fill_index] * amounts[:fill_index])
-        # Partial level contribution  
-        partial_weighted = last_level_price * partial_amount
-        total_weighted = full_levels_weighted + partial_weighted
+    if NUMBA_AVAILABLE:
+        vwap, volume, levels_used, fully_filled = _vwap_kernel(depth.prices, depth.amounts, target_notional)
     else:
-        total_weighted = last_level_price * partial_amount
-    
-    vwap = total_weighted / total_amount_filled if total_amount_filled > 0 else 0.0
+        vwap, volume, levels_used, fully_filled = _vwap_searchsorted(depth, target_notional)
     
     return VWAPResult(
         vwap_price=vwap,
-        total_volume=total_amount_filled,
-        levels_used=fill_index + 1,
-        fully_filled=True
+        total_volume=volume,
+        levels_used=levels_used,
+        fully_filled=fully_filled
     )
 
-def calculate_buy_vwap(asks: List[DepthLevel], target_notional: float) -> VWAPResult:
+def calculate_buy_vwap(asks: Levels, target_notional: float) -> VWAPResult:
     """Calculate VWAP for buying (using asks).
     
     Args:
-        asks: List of ask levels (sorted by price ascending)
+        asks: Ask levels (sorted by price ascending)
         target_notional: Target notional amount to buy
         
     Returns:
@@ -105,11 +146,11 @@ def calculate_buy_vwap(asks: List[DepthLevel], target_notional: float) -> VWAPRe
     """
     return calculate_vwap(asks, target_notional, 'buy')
 
-def calculate_sell_vwap(bids: List[DepthLevel], target_notional: float) -> VWAPResult:
+def calculate_sell_vwap(bids: Levels, target_notional: float) -> VWAPResult:
     """Calculate VWAP for selling (using bids).
     
     Args:
-        bids: List of bid levels (sorted by price descending)
+        bids: Bid levels (sorted by price descending)
         target_notional: Target notional amount to sell
         
     Returns:
@@ -140,7 +181,7 @@ def get_effective_price_after_fees(vwap_result: VWAPResult, fee_rate: float,
         # For spread calculation, we need the effective price we receive
         return vwap_result.vwap_price * (1 - fee_rate)
 
-def check_sufficient_depth(levels: List[DepthLevel], min_notional: float, 
+def check_sufficient_depth(levels: Levels, min_notional: float, 
                           max_levels: int = 10) -> bool:
     """Check if there's sufficient depth for a given notional amount.
     
@@ -152,37 +193,47 @@ def check_sufficient_depth(levels: List[DepthLevel], min_notional: float,
     Returns:
         True if sufficient depth exists
     """
-    if not levels:
+    if len(levels) == 0 or max_levels <= 0:
         return False
     
-    # Limit to max_levels
-    limited_levels = levels[:max_levels]
-    
-    # Calculate total available notional
-    total_notional = sum(level.price * level.amount for level in limited_levels)
+    # Total available notional within the first max_levels levels
+    depth = as_depth_arrays(levels)
+    total_notional = float(depth.cum_notional[min(max_levels, len(depth)) - 1])
     
     return total_notional >= min_notional
 
-def estimate_slippage(levels: List[DepthLevel], target_notional: float) -> float:
-    """Estimate slippage compared to best price.
+def vwap_and_slippage(levels: Levels, target_notional: float) -> Tuple[VWAPResult, float]:
+    """Calculate the VWAP for a target notional and its slippage from the best price.
+    
+    Callers that need both get them from a single VWAP walk.
     
     Args:
         levels: Order book levels
         target_notional: Target notional amount
         
     Returns:
-        Slippage in basis points (positive means worse price)
+        Tuple of (VWAPResult, slippage in basis points); slippage is inf when
+        the target cannot be filled
     """
-    if not levels:
-        return float('inf')
-    
-    best_price = levels[0].price
-    vwap_result = calculate_vwap(levels, target_notional)
+    depth = as_depth_arrays(levels)
+    vwap_result = calculate_vwap(depth, target_notional)
     
     if not vwap_result.fully_filled or vwap_result.vwap_price <= 0:
-        return float('inf')
+        return vwap_result, float('inf')
     
-    # Calculate slippage in basis points
+    best_price = depth.prices[0]
     slippage = abs(vwap_result.vwap_price - best_price) / best_price * 10000
     
-    return slippage
+    return vwap_result, slippage
+
+def estimate_slippage(levels: Levels, target_notional: float) -> float:
+    """Estimate slippage compared to best price.
+    
+    Args:
+        levels: Order book levels
+        target_notional: Target notional amount
+        
+    Returns:
+        Slippage in basis points (positive means worse price)
+    """
+    return vwap_and_slippage(levels, target_notional)[1]
@@ -1,11 +1,13 @@
 """Cross-exchange arbitrage opportunity detection engine."""
 
 import logging
-from typing import Dict, List, Optional, Tuple
+import time
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from collections import Counter, defaultdict
 from datetime import datetime
 import asyncio
 
-from models import OrderBook, Opportunity, VWAPResult
+from models import FeesPublic, OrderBook, Opportunity, VWAPResult
 from depth import calculate_buy_vwap, calculate_sell_vwap, get_effective_price_after_fees
 from fees import fee_manager
 from config import config
@@ -17,7 +19,9 @@ class ArbitrageEngine:
     
     def __init__(self):
         self.order_books: Dict[Tuple[str, str], OrderBook] = {}  # (exchange, symbol) -> OrderBook
-        self.last_scan_time = datetime.utcnow()
+        self.books_by_symbol: Dict[str, Dict[str, OrderBook]] = defaultdict(dict)  # symbol -> {exchange: OrderBook}
+        self.exchange_counts: Counter = Counter()  # exchange -> number of books held
+        self.last_scan_mono = time.monotonic()
         
     def update_order_book(self, order_book: OrderBook) -> None:
         """Update order book for an exchange/symbol pair.
@@ -26,7 +30,10 @@ class ArbitrageEngine:
             order_book: New order book data
         """
         key = (order_book.exchange, order_book.symbol)
+        if key not in self.order_books:
+            self.exchange_counts[order_book.exchange] += 1
         self.order_books[key] = order_book
+        self.books_by_symbol[order_book.symbol][order_book.exchange] = order_book
         
     async def scan_opportunities(self, symbols: List[str], 
                                exchanges: List[str]) -> List[Opportunity]:
@@ -40,21 +47,32 @@ class ArbitrageEngine:
             List of arbitrage opportunities found
         """
         opportunities = []
+        exchange_set = frozenset(exchanges)
         
-        for symbol in symbols:
-            symbol_opportunities = await self._scan_symbol_opportunities(symbol, exchanges)
-            opportunities.extend(symbol_opportunities)
+        # Symbols are independent; scan them concurrently so fee lookups overlap
+        results = await asyncio.gather(
+            *(self._scan_symbol_opportunities(symbol, exchange_set) for symbol in symbols),
+            return_exceptions=True
+        )
         
-        self.last_scan_time = datetime.utcnow()
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, BaseException):
+                logger.warning(f"Error scanning {symbol} for opportunities: {result}")
+                continue
+            opportunities.extend(result)
+        
+        self.last_scan_mono = time.monotonic()
         return opportunities
     
     async def _scan_symbol_opportunities(self, symbol: str, 
-                                       exchanges: List[str]) -> List[Opportunity]:
+                                       exchanges: FrozenSet[str]) -> List[Opportunity]:
         """Scan opportunities for a specific symbol across exchanges.
         
         Args:
             symbol: Symbol to scan
-            exchanges: List of exchanges to compare
+            exchanges: Set of exchanges to compare
             
         Returns:
             List of opportunities for this symbol
@@ -64,44 +82,63 @@ class ArbitrageEngine:
         # Get all available order books for this symbol
         symbol_books: Dict[str, OrderBook] = {}
         
-        for exchange in exchanges:
-            key = (exchange, symbol)
-            if key in self.order_books:
-                book = self.order_books[key]
-                # Only use recent order books (within last 60 seconds)
-                age = (datetime.utcnow() - book.timestamp).total_seconds()
-                if age <= 60 and book.bids and book.asks:
-                    symbol_books[exchange] = book
+        now_ns = time.time_ns()
+        
+        for exchange, book in self.books_by_symbol.get(symbol, {}).items():
+            if exchange not in exchanges:
+                continue
+            # Only use recent order books (within last 60 seconds)
+            age = (now_ns - book.timestamp_ns) / 1e9
+            if age <= 60 and len(book.bids) and len(book.asks):
+                symbol_books[exchange] = book
         
         if len(symbol_books) < 2:
             return opportunities
         
-        # Compare all exchange pairs
+        # Fetch each exchange's fees once rather than once per pair
         exchange_names = list(symbol_books.keys())
+        fees = await asyncio.gather(*(fee_manager.get_fees(exchange, symbol) for exchange in exchange_names))
+        fees_map: Dict[str, FeesPublic] = dict(zip(exchange_names, fees))
+        
+        # Each book's buy and sell VWAP is the same whichever exchange it is paired
+        # with, so compute them once per exchange; sides that cannot fill are dropped
+        target_notional = config.MIN_NOTIONAL
+        buy_vwaps: Dict[str, VWAPResult] = {}
+        sell_vwaps: Dict[str, VWAPResult] = {}
         
-        for i in range(len(exchange_names)):
-            for j in range(i + 1, len(exchange_names)):
-                buy_exchange = exchange_names[i]
-                sell_exchange = exchange_names[j]
-                
-                # Check both directions
-                opp1 = await self._check_opportunity(
-                    symbol, buy_exchange, sell_exchange, symbol_books
-                )
-                if opp1:
-                    opportunities.append(opp1)
-                
-                opp2 = await self._check_opportunity(
-                    symbol, sell_exchange, buy_exchange, symbol_books
-                )
-                if opp2:
-                    opportunities.append(opp2)
+        for exchange, book in symbol_books.items():
+            buy_vwap = calculate_buy_vwap(book.ask_depth, target_notional)
+            if buy_vwap.fully_filled:
+                buy_vwaps[exchange] = buy_vwap
+            
+            sell_vwap = calculate_sell_vwap(book.bid_depth, target_notional)
+            if sell_vwap.fully_filled:
+                sell_vwaps[exchange] = sell_vwap
+        
+        # Compare all exchange pairs, checking both directions
+        pairs = [(buy_exchange, sell_exchange)
+                 for buy_exchange in buy_vwaps
+                 for sell_exchange in sell_vwaps
+                 if buy_exchange != sell_exchange]
+        
+        for buy_exchange, sell_exchange in pairs:
+            opportunity = self._check_opportunity(
+                symbol, buy_exchange, sell_exchange, symbol_books,
+                fees_map[buy_exchange], fees_map[sell_exchange],
+                buy_vwaps[buy_exchange], sell_vwaps[sell_exchange]
+            )
+            if opportunity:
+                opportunities.append(opportunity)
         
         return opportunities
     
-    async def _check_opportunity(self, symbol: str, buy_exchange: str, 
-                               sell_exchange: str, 
-                               symbol_books: Dict[str, OrderBook]) -> Optional[Opportunity]:
+    def _check_opportunity(self, symbol: str, buy_exchange: str, 
+                         sell_exchange: str, 
+                         symbol_books: Dict[str, OrderBook],
+                         buy_fees: FeesPublic,
+                         sell_fees: FeesPublic,
+                         buy_vwap: VWAPResult,
+                         sell_vwap: VWAPResult) -> Optional[Opportunity]:
         """Check for arbitrage opportunity between two exchanges.
         
         Args:
@@ -109,6 +146,10 @@ class ArbitrageEngine:
             buy_exchange: Exchange to buy from
             sell_exchange: Exchange to sell to
             symbol_books: Order books for all exchanges
+            buy_fees: Fees on the buy exchange
+            sell_fees: Fees on the sell exchange
+            buy_vwap: Filled VWAP for buying the target notional on the buy exchange
+            sell_vwap: Filled VWAP for selling the target notional on the sell exchange
             
         Returns:
             Opportunity if found, None otherwise
@@ -119,38 +160,33 @@ class ArbitrageEngine:
         if not buy_book or not sell_book:
             return None
         
-        if not buy_book.asks or not sell_book.bids:
+        if not len(buy_book.asks) or not len(sell_book.bids):
             return None
         
         try:
-            # Get fees for both exchanges
-            buy_fees = await fee_manager.get_fees(buy_exchange, symbol)
-            sell_fees = await fee_manager.get_fees(sell_exchange, symbol)
+            buy_mult = buy_fees.buy_mult(symbol)  # 1 + taker fee
+            sell_mult = sell_fees.sell_mult(symbol)  # 1 - taker fee
             
-            # Calculate VWAP for the target notional
-            target_notional = config.MIN_NOTIONAL
-            
-            # Calculate buy VWAP (using asks from buy exchange)
-            buy_vwap = calculate_buy_vwap(buy_book.asks, target_notional)
-            if not buy_vwap.fully_filled:
+            # Top of book bounds the VWAP spread (buy VWAP >= best ask, sell VWAP <= best bid),
+            # so skip the depth walk when even the best prices cannot clear the threshold
+            best_buy = float(buy_book.asks[0, 0]) * buy_mult
+            best_sell = float(sell_book.bids[0, 0]) * sell_mult
+            if best_sell <= best_buy:
                 return None
-            
-            # Calculate sell VWAP (using bids from sell exchange)  
-            sell_vwap = calculate_sell_vwap(sell_book.bids, target_notional)
-            if not sell_vwap.fully_filled:
+            if (best_sell - best_buy) / ((best_sell + best_buy) / 2) * 10000 < config.MIN_SPREAD_BPS:
                 return None
             
+            target_notional = config.MIN_NOTIONAL
+            
             # Apply fees
             buy_price_before_fees = buy_vwap.vwap_price
             sell_price_before_fees = sell_vwap.vwap_price
             
             # For buying: price increases due to fees
-            buy_taker_fee = buy_fees.get_fees(symbol)[1]  # taker fee
-            buy_price_after_fees = buy_price_before_fees * (1 + buy_taker_fee)
+            buy_price_after_fees = buy_price_before_fees * buy_mult
             
             # For selling: we receive less due to fees
-            sell_taker_fee = sell_fees.get_fees(symbol)[1]  # taker fee
-            sell_price_after_fees = sell_price_before_fees * (1 - sell_taker_fee)
+            sell_price_after_fees = sell_price_before_fees * sell_mult
             
             # Check if opportunity exists
             if sell_price_after_fees <= buy_price_after_fees:
@@ -164,8 +200,9 @@ class ArbitrageEngine:
             if spread_bps < config.MIN_SPREAD_BPS:
                 return None
             
-            # Create opportunity
-            opportunity = Opportunity(
+            # Create opportunity; every field comes from validated VWAPResult/FeesPublic
+            # values, so skip re-validating them for each survivor
+            opportunity = Opportunity.model_construct(
                 symbol=symbol,
                 buy_exchange=buy_exchange,
                 sell_exchange=sell_exchange,
@@ -199,11 +236,11 @@ class ArbitrageEngine:
         Returns:
             True if all books are recent enough to be from WebSocket
         """
-        now = datetime.utcnow()
+        now_ns = time.time_ns()
         
         for book in books:
             # If data is older than 5 seconds, assume it's from REST
-            age = (now - book.timestamp).total_seconds()
+            age = (now_ns - book.timestamp_ns) / 1e9
             if age > 5:
                 return False
         
@@ -215,27 +252,13 @@ class ArbitrageEngine:
         Returns:
             Dictionary with engine stats
         """
-        now = datetime.utcnow()
-        
-        # Count active order books by exchange
-        exchange_counts = {}
-        total_books = 0
-        recent_books = 0
-        
-        for (exchange, symbol), book in self.order_books.items():
-            age = (now - book.timestamp).total_seconds()
-            total_books += 1
-            
-            if age <= 60:  # Recent data
-                recent_books += 1
-                
-            if exchange not in exchange_counts:
-                exchange_counts[exchange] = 0
-            exchange_counts[exchange] += 1
+        # Books updated within the last 60 seconds; exchange counts are kept on update
+        cutoff_ns = time.time_ns() - 60 * 1_000_000_000
+        recent_books = sum(1 for book in self.order_books.values() if book.timestamp_ns >= cutoff_ns)
         
         return {
-            'total_order_books': total_books,
+            'total_order_books': len(self.order_books),
             'recent_order_books': recent_books,
-            'exchange_counts': exchange_counts,
-            'last_scan_age_seconds': (now - self.last_scan_time).total_seconds()
+            'exchange_counts': dict(self.exchange_counts),
+            'last_scan_age_seconds': time.monotonic() - self.last_scan_mono
         }
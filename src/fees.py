@@ -32,7 +32,7 @@ class FeeManager:
             'mexc': {'maker': 0.0000, 'taker': 0.0020},     # 0.00%/0.20%
         }
         
-        self.fee_cache: Dict[str, FeesPublic] = {}
+        self.fee_cache: Dict[str, Dict[Optional[str], FeesPublic]] = {}  # exchange -> {symbol: fees}
         self.env_overrides = config.get_fee_overrides()
     
     async def get_fees(self, exchange_name: str, symbol: Optional[str] = None) -> FeesPublic:
@@ -45,10 +45,9 @@ class FeeManager:
         Returns:
             FeesPublic object with fee information
         """
-        cache_key = f"{exchange_name}_{symbol or 'default'}"
-        
-        if cache_key in self.fee_cache:
-            return self.fee_cache[cache_key]
+        exchange_cache = self.fee_cache.get(exchange_name)
+        if exchange_cache and symbol in exchange_cache:
+            return exchange_cache[symbol]
         
         # Try to get fees from exchange API
         fees = await self._fetch_public_fees(exchange_name)
@@ -63,7 +62,7 @@ class FeeManager:
                 fees.taker = overrides['taker']
                 fees.source = 'env'
         
-        self.fee_cache[cache_key] = fees
+        self.fee_cache.setdefault(exchange_name, {})[symbol] = fees
         return fees
     
     async def _fetch_public_fees(self, exchange_name: str) -> FeesPublic:
@@ -161,11 +160,8 @@ class FeeManager:
         Returns:
             Tuple of (effective_price_after_fees, effective_amount)
         """
-        maker_fee, taker_fee = fees.get_fees(symbol)
-        fee_rate = maker_fee if is_maker else taker_fee
-        
         # For buy orders, we pay more (price increases)
-        effective_price = price * (1 + fee_rate)
+        effective_price = price * fees.buy_mult(symbol, is_maker)
         
         return effective_price, amount
     
@@ -183,11 +179,8 @@ class FeeManager:
         Returns:
             Tuple of (effective_price_after_fees, effective_amount_after_fees)
         """
-        maker_fee, taker_fee = fees.get_fees(symbol)
-        fee_rate = maker_fee if is_maker else taker_fee
-        
         # For sell orders, we receive less (amount decreases)
-        effective_amount = amount * (1 - fee_rate)
+        effective_amount = amount * fees.sell_mult(symbol, is_maker)
         
         return price, effective_amount
     
@@ -218,9 +211,10 @@ class FeeManager:
         Returns:
             Fee summary string
         """
-        if exchange_name in self.fee_cache:
-            fees = self.fee_cache[exchange_name]
-        else:
+        # Exchange-wide entry, cached by get_fees(exchange_name) without a symbol
+        fees = self.fee_cache.get(exchange_name, {}).get(None)
+        
+        if fees is None:
             # Get default fees without caching
             if exchange_name in self.known_fees:
                 known = self.known_fees[exchange_name]
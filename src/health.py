@@ -3,8 +3,8 @@
 import asyncio
 import logging
 import psutil
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
 
 from models import ExchangeHealth
 from registry import registry
@@ -13,11 +13,23 @@ from db import db_manager
 
 logger = logging.getLogger(__name__)
 
+# Interval between event loop lag samples
+LAG_PROBE_INTERVAL_S = 0.5
+
+def _read_system_usage() -> Tuple[float, float]:
+    """Read CPU and memory usage; blocking, so called via asyncio.to_thread.
+    
+    Returns:
+        Tuple of (cpu_percent, memory_percent)
+    """
+    return psutil.cpu_percent(interval=None), psutil.virtual_memory().percent
+
 class HealthMonitor:
     """Monitors health of exchanges and system components."""
     
     def __init__(self):
         self.monitor_task: Optional[asyncio.Task] = None
+        self.lag_probe_handle: Optional[asyncio.TimerHandle] = None
         self.system_stats = {
             'cpu_percent': 0.0,
             'memory_percent': 0.0,
@@ -27,10 +39,15 @@ class HealthMonitor:
     async def start(self) -> None:
         """Start health monitoring."""
         self.monitor_task = asyncio.create_task(self._monitor_loop())
+        self._schedule_lag_probe(asyncio.get_running_loop())
         logger.info("Health monitor started")
     
     async def stop(self) -> None:
         """Stop health monitoring."""
+        if self.lag_probe_handle:
+            self.lag_probe_handle.cancel()
+            self.lag_probe_handle = None
+        
         if self.monitor_task:
             self.monitor_task.cancel()
             try:
@@ -57,19 +74,27 @@ class HealthMonitor:
             # Update system stats
             await self._update_system_stats()
             
-            # Collect health for each exchange
-            for exchange_name in registry.exchanges.keys():
-                health = await self._collect_exchange_health(exchange_name)
-                if health:
-                    # Store in database
-                    await db_manager.store_health_snapshot(health)
-                    
-                    # Update registry
-                    registry.health[exchange_name] = health
-                    
-                    # Log unhealthy exchanges
-                    if not health.is_healthy():
-                        logger.warning(f"Exchange {exchange_name} is unhealthy: {health}")
+            # Collect health for every exchange concurrently
+            exchange_names = list(registry.exchanges.keys())
+            results = await asyncio.gather(
+                *(self._collect_exchange_health(name) for name in exchange_names),
+                return_exceptions=True
+            )
+            collected = {
+                name: health for name, health in zip(exchange_names, results)
+                if isinstance(health, ExchangeHealth)
+            }
+            
+            # Store in database
+            await asyncio.gather(*(db_manager.store_health_snapshot(health) for health in collected.values()))
+            
+            # Update registry
+            registry.health.update(collected)
+            
+            # Log unhealthy exchanges
+            for exchange_name, health in collected.items():
+                if not health.is_healthy():
+                    logger.warning(f"Exchange {exchange_name} is unhealthy: {health}")
             
         except Exception as e:
             logger.error(f"Error collecting health data: {e}")
@@ -104,23 +129,34 @@ class HealthMonitor:
     async def _update_system_stats(self) -> None:
         """Update system performance statistics."""
         try:
-            # CPU usage
-            self.system_stats['cpu_percent'] = psutil.cpu_percent(interval=None)
-            
-            # Memory usage
-            memory = psutil.virtual_memory()
-            self.system_stats['memory_percent'] = memory.percent
-            
-            # Event loop lag measurement
-            start_time = asyncio.get_event_loop().time()
-            await asyncio.sleep(0)  # Yield control
-            end_time = asyncio.get_event_loop().time()
-            lag_ms = (end_time - start_time) * 1000
-            self.system_stats['event_loop_lag_ms'] = lag_ms
+            # CPU and memory usage, read in one worker-thread hop so the syscalls
+            # never block the event loop
+            cpu_percent, memory_percent = await asyncio.to_thread(_read_system_usage)
+            self.system_stats['cpu_percent'] = cpu_percent
+            self.system_stats['memory_percent'] = memory_percent
             
         except Exception as e:
             logger.debug(f"Error updating system stats: {e}")
     
+    def _schedule_lag_probe(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Schedule the next event loop lag sample.
+        
+        Args:
+            loop: Event loop to measure
+        """
+        expected = loop.time() + LAG_PROBE_INTERVAL_S
+        self.lag_probe_handle = loop.call_at(expected, self._lag_probe, loop, expected)
+    
+    def _lag_probe(self, loop: asyncio.AbstractEventLoop, expected: float) -> None:
+        """Record how late this callback ran, then reschedule it.
+        
+        Args:
+            loop: Event loop being measured
+            expected: Loop time the callback was scheduled for
+        """
+        self.system_stats['event_loop_lag_ms'] = max(0.0, loop.time() - expected) * 1000
+        self._schedule_lag_probe(loop)
+    
     def get_system_health_summary(self) -> Dict[str, any]:
         """Get overall system health summary.
         
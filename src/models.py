@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 from typing import List, Optional, Dict, Any, Literal, Tuple
-from datetime import datetime
-from pydantic import BaseModel, Field
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import cached_property
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
 import numpy as np
 
+def _fmt_ts(t: datetime) -> str:
+    """Format a timestamp as HH:MM:SS UTC without going through strftime."""
+    return "%02d:%02d:%02d UTC" % (t.hour, t.minute, t.second)
+
 class MarketMeta(BaseModel):
     """Exchange market metadata."""
     symbol: str
@@ -26,17 +32,96 @@ class DepthLevel(BaseModel):
     def __hash__(self) -> int:
         return hash((self.price, self.amount))
 
+def as_level_array(levels: Any) -> np.ndarray:
+    """Coerce depth levels into an (N, 2) float64 array of [price, amount] rows.
+    
+    Args:
+        levels: An (N, 2) array, DepthLevel objects or [price, amount] pairs
+        
+    Returns:
+        Array with one row per level; arrays of the right shape are returned as-is
+    """
+    if isinstance(levels, np.ndarray) and levels.dtype == np.float64 and levels.ndim == 2:
+        return levels
+    if len(levels) and hasattr(levels[0], 'price'):
+        levels = [(level.price, level.amount) for level in levels]
+    return np.asarray(levels, dtype=np.float64).reshape(-1, 2)
+
+@dataclass(frozen=True, slots=True)
+class DepthArrays:
+    """Price and amount columns of one book side with their running totals.
+    
+    Built once per order book snapshot so repeated VWAP and depth queries
+    against the same side skip the conversion and cumulative sums.
+    """
+    prices: np.ndarray
+    amounts: np.ndarray
+    cum_notional: np.ndarray
+    cum_amount: np.ndarray
+    
+    @classmethod
+    def from_levels(cls, levels: Any) -> DepthArrays:
+        """Build depth arrays from anything accepted by as_level_array."""
+        levels = as_level_array(levels)
+        prices = levels[:, 0]
+        amounts = levels[:, 1]
+        return cls(prices, amounts, np.cumsum(prices * amounts), np.cumsum(amounts))
+    
+    def __len__(self) -> int:
+        return len(self.prices)
+
+def as_depth_arrays(levels: Any) -> DepthArrays:
+    """Return levels as DepthArrays, building them only if needed."""
+    if hasattr(levels, 'cum_notional'):
+        return levels
+    return DepthArrays.from_levels(levels)
+
 class OrderBook(BaseModel):
-    """Order book snapshot."""
+    """Order book snapshot.
+    
+    Each side is an (N, 2) float64 array of [price, amount] rows, bids
+    highest price first and asks lowest first. The snapshot time is kept as
+    integer nanoseconds since the epoch; ``timestamp`` converts it on read.
+    """
     symbol: str
     exchange: str
-    bids: List[DepthLevel]
-    asks: List[DepthLevel]
-    timestamp: datetime
+    bids: np.ndarray
+    asks: np.ndarray
+    timestamp_ns: int
     nonce: Optional[int] = None
     
     class Config:
         arbitrary_types_allowed = True
+    
+    @model_validator(mode='before')
+    @classmethod
+    def _accept_datetime_timestamp(cls, data: Any) -> Any:
+        # Callers may still pass a naive UTC datetime as ``timestamp``
+        if isinstance(data, dict) and 'timestamp' in data and 'timestamp_ns' not in data:
+            data = dict(data)
+            ts = data.pop('timestamp')
+            data['timestamp_ns'] = round(ts.replace(tzinfo=timezone.utc).timestamp() * 1e6) * 1000
+        return data
+    
+    @field_validator('bids', 'asks', mode='before')
+    @classmethod
+    def _coerce_levels(cls, levels: Any) -> np.ndarray:
+        return as_level_array(levels)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Snapshot time as a naive UTC datetime."""
+        return datetime.utcfromtimestamp(self.timestamp_ns / 1e9)
+    
+    @cached_property
+    def bid_depth(self) -> DepthArrays:
+        """Bid side as depth arrays, built on first use."""
+        return DepthArrays.from_levels(self.bids)
+    
+    @cached_property
+    def ask_depth(self) -> DepthArrays:
+        """Ask side as depth arrays, built on first use."""
+        return DepthArrays.from_levels(self.asks)
 
 class FeesPublic(BaseModel):
     """Public fee information for an exchange."""
@@ -49,6 +134,9 @@ class FeesPublic(BaseModel):
         description="Symbol-specific (maker, taker) fees"
     )
     
+    # (symbol, is_maker) -> (buy multiplier, sell multiplier), filled on first use
+    _multipliers: Dict[Tuple[Optional[str], bool], Tuple[float, float]] = PrivateAttr(default_factory=dict)
+    
     def get_fees(self, symbol: Optional[str] = None) -> Tuple[float, float]:
         """Get (maker, taker) fees for a symbol or exchange default.
         
@@ -61,6 +149,45 @@ class FeesPublic(BaseModel):
         if symbol and symbol in self.symbol_specific:
             return self.symbol_specific[symbol]
         return (self.maker, self.taker)
+    
+    def _fee_multipliers(self, symbol: Optional[str], is_maker: bool) -> Tuple[float, float]:
+        """Get the cached (1 + fee, 1 - fee) pair for a symbol and order type."""
+        key = (symbol, is_maker)
+        multipliers = self._multipliers.get(key)
+        
+        if multipliers is None:
+            maker_fee, taker_fee = self.get_fees(symbol)
+            fee_rate = maker_fee if is_maker else taker_fee
+            multipliers = self._multipliers[key] = (1.0 + fee_rate, 1.0 - fee_rate)
+        
+        return multipliers
+    
+    def buy_mult(self, symbol: Optional[str] = None, is_maker: bool = False) -> float:
+        """Get the price multiplier for buying, i.e. 1 + fee rate.
+        
+        Multipliers are cached per (symbol, is_maker), so fee rates should not
+        be changed after the first lookup.
+        
+        Args:
+            symbol: Trading symbol
+            is_maker: Whether this is a maker order (default: taker)
+            
+        Returns:
+            Multiplier to apply to a buy price
+        """
+        return self._fee_multipliers(symbol, is_maker)[0]
+    
+    def sell_mult(self, symbol: Optional[str] = None, is_maker: bool = False) -> float:
+        """Get the multiplier for selling, i.e. 1 - fee rate.
+        
+        Args:
+            symbol: Trading symbol
+            is_maker: Whether this is a maker order (default: taker)
+            
+        Returns:
+            Multiplier to apply to a sell price or amount
+        """
+        return self._fee_multipliers(symbol, is_maker)[1]
 
 class Opportunity(BaseModel):
     """Cross-exchange arbitrage opportunity."""
@@ -81,10 +208,26 @@ class Opportunity(BaseModel):
     timestamp: datetime
     mode: Literal["ws", "rest"]
     
-    @property
+    class Config:
+        frozen = True  # Immutable once detected; hashable for use as set/dict keys
+    
+    @cached_property
     def dedupe_key(self) -> str:
         """Generate deduplication key."""
         return f"CROSS_{self.buy_exchange}_{self.sell_exchange}_{self.symbol}_{int(self.notional)}"
+    
+    @cached_property
+    def alert_text(self) -> str:
+        """Telegram alert text, rendered once per opportunity."""
+        return "\n".join((
+            "🔄 [ARB] %s %s→%s" % (self.symbol, self.buy_exchange, self.sell_exchange),
+            "💰 Spread: %.2f bps | Notional: $%.0f" % (self.spread_bps, self.notional),
+            "📊 Buy@%.6f / Sell@%.6f" % (self.buy_price_after_fees, self.sell_price_after_fees),
+            "📈 Depth: top%d | Fees: taker | Mode: %s" % (
+                max(self.buy_depth_levels, self.sell_depth_levels), self.mode
+            ),
+            "🕐 " + _fmt_ts(self.timestamp),
+        ))
 
 class TriOpportunity(BaseModel):
     """Triangular arbitrage opportunity."""
@@ -108,11 +251,32 @@ class TriOpportunity(BaseModel):
     fees: Tuple[float, float]  # (maker, taker) for this exchange
     timestamp: datetime
     
-    @property
+    class Config:
+        frozen = True  # Immutable once detected; hashable for use as set/dict keys
+    
+    @cached_property
     def dedupe_key(self) -> str:
         """Generate deduplication key."""
         path_str = "_".join(self.path)
         return f"TRI_{self.exchange}_{path_str}_{int(self.notional)}"
+    
+    @cached_property
+    def alert_text(self) -> str:
+        """Telegram alert text, rendered once per opportunity."""
+        base = self.base_asset
+        return "\n".join((
+            "🔺 [TRI] %s %s cycle: %s" % (self.exchange, base, "→".join(self.path)),
+            "💎 Gain: %.2f bps | Start: %.0f %s → End: %.4f %s" % (
+                self.gain_bps, self.start_amount, base, self.end_amount, base
+            ),
+            "🔗 Leg1 %s @ %.6f | Leg2 %s @ %.6f | Leg3 %s @ %.6f" % (
+                self.leg1_symbol, self.leg1_price,
+                self.leg2_symbol, self.leg2_price,
+                self.leg3_symbol, self.leg3_price,
+            ),
+            "📊 Depth: combined | Fees: taker",
+            "🕐 " + _fmt_ts(self.timestamp),
+        ))
 
 class ExchangeHealth(BaseModel):
     """Exchange connection health metrics."""
@@ -2,7 +2,7 @@
 
 import asyncio
 import logging
-from typing import Dict, List, Set, Optional, Any, Tuple
+from typing import Dict, FrozenSet, List, Sequence, Set, Optional, Any, Tuple
 import ccxt
 from models import MarketMeta, ExchangeHealth
 from config import config
@@ -16,6 +16,8 @@ class ExchangeRegistry:
         self.exchanges: Dict[str, ccxt.Exchange] = {}
         self.markets: Dict[str, Dict[str, MarketMeta]] = {}
         self.health: Dict[str, ExchangeHealth] = {}
+        # exchange -> tri bases -> leg symbols; dropped whenever markets reload
+        self._tri_symbol_sets: Dict[str, Dict[Tuple[str, ...], FrozenSet[str]]] = {}
         self._semaphore = asyncio.Semaphore(config.MAX_CONCURRENT_EXCHANGES)
     
     async def discover_exchanges(self) -> List[str]:
@@ -40,7 +42,7 @@ class ExchangeRegistry:
             # Only include specified exchanges
             candidate_exchanges = [
                 ex for ex in all_exchanges 
-                if ex.lower() in [inc.lower() for inc in config.INCLUDE_EXCHANGES]
+                if ex.lower() in config.INCLUDE_EXCHANGES
             ]
         else:
             # Include all by default
@@ -48,10 +50,9 @@ class ExchangeRegistry:
         
         # Remove excluded exchanges
         if config.EXCLUDE_EXCHANGES:
-            exclude_lower = [exc.lower() for exc in config.EXCLUDE_EXCHANGES]
             candidate_exchanges = [
                 ex for ex in candidate_exchanges 
-                if ex.lower() not in exclude_lower
+                if ex.lower() not in config.EXCLUDE_EXCHANGES
             ]
         
         logger.info(f"Testing {len(candidate_exchanges)} candidate exchanges...")
@@ -116,6 +117,7 @@ class ExchangeRegistry:
                 # Store exchange and markets
                 self.exchanges[exchange_name] = exchange
                 self.markets[exchange_name] = {}
+                self._tri_symbol_sets.pop(exchange_name, None)
                 
                 # Convert to our MarketMeta format - spot markets only
                 loaded_count = 0
@@ -204,12 +206,12 @@ class ExchangeRegistry:
             if count >= min_exchanges
         }
     
-    def get_triangular_symbols(self, exchange_name: str, base_assets: List[str]) -> List[Tuple[str, str, str]]:
+    def get_triangular_symbols(self, exchange_name: str, base_assets: Sequence[str]) -> List[Tuple[str, str, str]]:
         """Get potential triangular arbitrage paths for an exchange.
         
         Args:
             exchange_name: Name of the exchange
-            base_assets: List of base assets (e.g., ["USDT", "USDC", "BTC"])
+            base_assets: Base assets (e.g., ("USDT", "USDC", "BTC"))
             
         Returns:
             List of (base, asset2, asset3) tuples forming valid triangular paths
@@ -221,7 +223,7 @@ class ExchangeRegistry:
         paths = []
         
         # Get excluded quote assets from config
-        exclude_quotes = set(config.TRI_EXCLUDE_QUOTES)
+        exclude_quotes = config.TRI_EXCLUDE_QUOTES
         
         # Get active symbols grouped by base/quote
         symbols_by_base: Dict[str, List[str]] = {}
@@ -283,6 +285,39 @@ class ExchangeRegistry:
             logger.debug(f"Found {len(paths)} triangular paths for {exchange_name}")
         return paths
     
+    def get_triangular_symbol_set(self, exchange_name: str, base_assets: Sequence[str]) -> FrozenSet[str]:
+        """Get every symbol a triangular path on an exchange may trade, in both directions.
+        
+        The set is computed once per exchange and base list and reused until the
+        exchange's markets are reloaded.
+        
+        Args:
+            exchange_name: Name of the exchange
+            base_assets: Base assets (e.g., ("USDT", "USDC", "BTC"))
+            
+        Returns:
+            Frozen set of leg symbols and their reverses
+        """
+        bases = tuple(base_assets)
+        cached = self._tri_symbol_sets.setdefault(exchange_name, {})
+        if bases in cached:
+            return cached[bases]
+        
+        join = "/".join
+        symbols = set()
+        for base, asset2, asset3 in self.get_triangular_symbols(exchange_name, base_assets):
+            symbols.update((
+                join((base, asset2)),
+                join((asset2, asset3)),
+                join((asset3, base)),
+                join((asset2, base)),  # Reverse symbols
+                join((asset3, asset2)),
+                join((base, asset3)),
+            ))
+        
+        cached[bases] = frozenset(symbols)
+        return cached[bases]
+    
     def has_websocket_support(self, exchange_name: str) -> bool:
         """Check if exchange supports WebSocket order book streaming."""
         # CoinTR has native WebSocket support
@@ -330,14 +365,10 @@ class ExchangeRegistry:
         """Test CoinTR exchange connectivity."""
         try:
             import aiohttp
-            import ssl
-            
-            # Test CoinTR REST API with SSL verification disabled
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
+            from connectors.cointr import SSL_CONTEXT
             
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
+            # Test CoinTR REST API with the connector's shared TLS context
+            connector = aiohttp.TCPConnector(ssl=SSL_CONTEXT)
             async with aiohttp.ClientSession(connector=connector) as session:
                 url = "https://api.cointr.com/api/v2/spot/public/symbols"
                 async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
@@ -382,6 +413,7 @@ class ExchangeRegistry:
                             
                             self.exchanges['cointr'] = fake_exchange
                             self.markets['cointr'] = sample_markets
+                            self._tri_symbol_sets.pop('cointr', None)
                             self.health['cointr'] = ExchangeHealth(
                                 exchange='cointr',
                                 rest_ok=True
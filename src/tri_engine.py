@@ -1,6 +1,7 @@
 """Triangular arbitrage detection engine."""
 
 import logging
+import time
 from typing import Dict, List, Optional, Tuple, Set
 from datetime import datetime
 import asyncio
@@ -249,7 +250,7 @@ class TriangularArbitrageEngine:
             if preferred_side == 'buy':
                 # Buying to_asset with from_asset (using asks)
                 target_notional = amount  # Amount of from_asset to spend
-                vwap = calculate_buy_vwap(book.asks, target_notional)
+                vwap = calculate_buy_vwap(book.ask_depth, target_notional)
                 
                 if vwap.fully_filled:
                     # Apply taker fees (we receive less to_asset)
@@ -261,12 +262,12 @@ class TriangularArbitrageEngine:
             else:
                 # Selling from_asset for to_asset (using bids)
                 # Convert amount to notional for VWAP calculation
-                if not book.bids:
+                if not len(book.bids):
                     return None
                 
-                best_bid = book.bids[0].price
+                best_bid = book.bids[0, 0]
                 target_notional = amount * best_bid
-                vwap = calculate_sell_vwap(book.bids, target_notional)
+                vwap = calculate_sell_vwap(book.bid_depth, target_notional)
                 
                 if vwap.fully_filled:
                     # Apply taker fees (we receive less to_asset)
@@ -284,12 +285,12 @@ class TriangularArbitrageEngine:
             if preferred_side == 'buy':
                 # We want to buy to_asset, but symbol is to_asset/from_asset
                 # So we're selling from_asset (using bids of reverse symbol)
-                if not book.bids:
+                if not len(book.bids):
                     return None
                 
-                best_bid = book.bids[0].price
+                best_bid = book.bids[0, 0]
                 target_notional = amount / best_bid  # Amount of to_asset we want
-                vwap = calculate_sell_vwap(book.bids, target_notional)
+                vwap = calculate_sell_vwap(book.bid_depth, target_notional)
                 
                 if vwap.fully_filled:
                     taker_fee = fees.get_fees(reverse_symbol)[1]
@@ -302,7 +303,7 @@ class TriangularArbitrageEngine:
                 # We want to sell from_asset, but symbol is to_asset/from_asset
                 # So we're buying to_asset (using asks of reverse symbol)
                 target_notional = amount  # Amount of from_asset we have
-                vwap = calculate_buy_vwap(book.asks, target_notional)
+                vwap = calculate_buy_vwap(book.ask_depth, target_notional)
                 
                 if vwap.fully_filled:
                     taker_fee = fees.get_fees(reverse_symbol)[1]
@@ -331,12 +332,12 @@ class TriangularArbitrageEngine:
         book = self.order_books[key]
         
         # Check if data is recent (within last 60 seconds)
-        age = (datetime.utcnow() - book.timestamp).total_seconds()
+        age = (time.time_ns() - book.timestamp_ns) / 1e9
         if age > 60:
             return None
         
         # Check if book has data
-        if not book.bids or not book.asks:
+        if not len(book.bids) or not len(book.asks):
             return None
         
         return book
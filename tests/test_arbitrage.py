@@ -2,19 +2,27 @@
 
 import sys
 import os
+import sqlite3
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 import pytest
 import asyncio
 import numpy as np
 from datetime import datetime
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 from src.models import DepthLevel, OrderBook, FeesPublic, Opportunity, TriOpportunity, VWAPResult
+from src import depth as depth_module
 from src.depth import calculate_vwap, calculate_buy_vwap, calculate_sell_vwap, get_effective_price_after_fees
 from src.fees import FeeManager
 from src.engine import ArbitrageEngine
 from src.symbolmap import SymbolMapper
+from src.alert import AlertManager, _dedupe_hash
+from src.connectors import _fastparse
+from src.connectors._fastparse import parse_levels
+from src.connectors.base import CircuitBreaker, TokenBucket
+from src.connectors.ccxt_generic import BatchedOrderBookFetcher
+from src.db import SCHEMA_VERSION, DatabaseManager
 
 class TestVWAPCalculation:
     """Test VWAP calculation functions."""
@@ -70,6 +78,42 @@ class TestVWAPCalculation:
         assert result.levels_used == 1
         assert abs(result.total_volume - 1.0) < 0.001
     
+    def test_cached_depth_matches_levels(self):
+        """Test that the book's cached depth arrays give the same VWAP as raw levels."""
+        asks = [
+            DepthLevel(price=100.0, amount=1.0),
+            DepthLevel(price=101.0, amount=2.0),
+        ]
+        book = OrderBook(symbol='BTC/USDT', exchange='test', bids=[], asks=asks,
+                         timestamp=datetime.utcnow())
+        
+        assert book.ask_depth is book.ask_depth
+        assert calculate_buy_vwap(book.ask_depth, 150.0) == calculate_buy_vwap(asks, 150.0)
+    
+    @pytest.mark.parametrize("implementation", ["walk", "searchsorted", "compiled"])
+    @pytest.mark.parametrize("target, expected", [
+        (50.0, (100.0, 0.5, 1, True)),                     # Best level covers it
+        (150.0, (150.0 / (1 + 50.0 / 101), 1 + 50.0 / 101, 2, True)),  # Partial fill of level 2
+        (302.0, (302.0 / 3, 3.0, 2, True)),                # Exactly fills level 2
+        (500.0, (101.0, 4.0, 3, False)),                   # Not enough depth
+    ])
+    def test_vwap_implementations_agree(self, implementation, target, expected):
+        """Test the VWAP walk (plain and numba-compiled) against the searchsorted path."""
+        if implementation == "compiled" and not depth_module.NUMBA_AVAILABLE:
+            pytest.skip("numba not installed")
+        
+        depth = depth_module.as_depth_arrays(np.array([[100.0, 1.0], [101.0, 2.0], [102.0, 1.0]]))
+        if implementation == "searchsorted":
+            result = depth_module._vwap_searchsorted(depth, target)
+        else:
+            walk = depth_module._vwap_walk if implementation == "walk" else depth_module._vwap_kernel
+            result = walk(depth.prices, depth.amounts, target)
+        
+        vwap, volume, levels_used, fully_filled = result
+        assert vwap == pytest.approx(expected[0])
+        assert volume == pytest.approx(expected[1])
+        assert (levels_used, fully_filled) == expected[2:]
+    
     def test_effective_price_after_fees(self):
         """Test effective price calculation after fees."""
         
@@ -165,6 +209,121 @@ class TestSymbolMapper:
         assert base == 'ETH'
         assert quote == 'USDC'
 
+class TestLevelParsing:
+    """Test raw order book level parsing."""
+    
+    def test_parse_levels_filters_and_sorts(self):
+        """Test that empty levels are dropped and prices sorted per side."""
+        raw = [["101.5", "2"], ["0", "1"], ["102", "1", "7"], ["100", "0"], ["99", "3"],
+               [98.0, None], ["nan", "1"]]
+        
+        bids = parse_levels(raw, descending=True)
+        assert bids.tolist() == [[102.0, 1.0], [101.5, 2.0], [99.0, 3.0]]
+        
+        asks = parse_levels(raw)
+        assert asks[:, 0].tolist() == [99.0, 101.5, 102.0]
+        
+        assert parse_levels([]).shape == (0, 2)
+    
+    @pytest.mark.parametrize("implementation", ["loop", "numpy", "compiled"])
+    def test_filter_sort_implementations_agree(self, implementation):
+        """Test that the loop kernel (plain and numba-compiled) matches the NumPy fallback."""
+        if implementation == "compiled" and not _fastparse.NUMBA_AVAILABLE:
+            pytest.skip("numba not installed")
+        
+        filter_sort = {
+            "loop": _fastparse._filter_sort_levels_loop,
+            "numpy": _fastparse._filter_sort_levels_numpy,
+            "compiled": _fastparse._filter_sort_levels,
+        }[implementation]
+        raw = np.array([[101.0, 2.0], [100.0, np.nan], [np.nan, 1.0], [-1.0, 1.0],
+                        [99.0, 1.0], [101.0, 3.0], [102.0, 0.0], [100.5, 4.0]])
+        
+        assert filter_sort(raw, True).tolist() == [[101.0, 2.0], [101.0, 3.0], [100.5, 4.0], [99.0, 1.0]]
+        assert filter_sort(raw, False).tolist() == [[99.0, 1.0], [100.5, 4.0], [101.0, 2.0], [101.0, 3.0]]
+
+class TestOrderBookBatching:
+    """Test batched REST order book fetching."""
+    
+    @pytest.mark.asyncio
+    async def test_duplicate_requests_share_one_call(self):
+        """Test that requests in one window are issued together and deduplicated."""
+        calls = []
+        
+        async def fetch_one(symbol, limit):
+            calls.append((symbol, limit))
+            return {'symbol': symbol}
+        
+        fetcher = BatchedOrderBookFetcher(fetch_one, flush_ms=5)
+        results = await asyncio.gather(
+            fetcher.fetch('BTC/USDT', 10),
+            fetcher.fetch('BTC/USDT', 10),
+            fetcher.fetch('ETH/USDT', 10),
+        )
+        
+        assert sorted(calls) == [('BTC/USDT', 10), ('ETH/USDT', 10)]
+        assert [r['symbol'] for r in results] == ['BTC/USDT', 'BTC/USDT', 'ETH/USDT']
+    
+    @pytest.mark.asyncio
+    async def test_request_joins_call_in_flight(self):
+        """Test that a request arriving while the same fetch is running waits on it."""
+        calls = []
+        release = asyncio.Event()
+        
+        async def fetch_one(symbol, limit):
+            calls.append((symbol, limit))
+            await release.wait()
+            return {'symbol': symbol}
+        
+        fetcher = BatchedOrderBookFetcher(fetch_one, flush_ms=1)
+        first = asyncio.ensure_future(fetcher.fetch('BTC/USDT', 10))
+        await asyncio.sleep(0.01)  # Let the first batch start
+        second = asyncio.ensure_future(fetcher.fetch('BTC/USDT', 10))
+        await asyncio.sleep(0.01)
+        
+        release.set()
+        assert (await first) == (await second) == {'symbol': 'BTC/USDT'}
+        assert calls == [('BTC/USDT', 10)]
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_paces_after_burst(self):
+        """Test that the bucket allows its burst, then one request per 1/rate seconds."""
+        bucket = TokenBucket(rate=100.0, capacity=2)
+        loop = asyncio.get_running_loop()
+        
+        start = loop.time()
+        for _ in range(4):
+            await bucket.acquire()
+        
+        # Two immediate tokens, then two more at 10 ms intervals
+        assert loop.time() - start >= 0.015
+    
+    def test_circuit_breaker_opens_and_probes(self):
+        """Test the breaker opens at the threshold and lets one probe through after cooldown."""
+        now = [0.0]
+        breaker = CircuitBreaker(threshold=3, cooldown=30.0, clock=lambda: now[0])
+        
+        for _ in range(3):
+            assert breaker.allow()
+            breaker.record_failure()
+        
+        assert breaker.state == 'open'
+        assert not breaker.allow()
+        
+        # After the cooldown exactly one probe is allowed
+        now[0] = 31.0
+        assert breaker.allow()
+        assert not breaker.allow()
+        
+        # A failed probe re-opens, a successful one closes
+        breaker.record_failure()
+        assert breaker.state == 'open'
+        now[0] = 62.0
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == 'closed'
+        assert breaker.allow()
+
 class TestArbitrageEngine:
     """Test arbitrage opportunity detection."""
     
@@ -221,6 +380,255 @@ class TestArbitrageEngine:
                 assert opp.buy_exchange in ['exchange_a', 'exchange_b']
                 assert opp.sell_exchange in ['exchange_a', 'exchange_b']
                 assert opp.spread_bps >= 0
+    
+    @pytest.mark.asyncio
+    async def test_fees_fetched_once_per_exchange(self):
+        """Test that fees are looked up once per exchange, not once per pair direction."""
+        engine = ArbitrageEngine()
+        timestamp = datetime.utcnow()
+        
+        engine.update_order_book(OrderBook(
+            symbol='BTC/USDT', exchange='exchange_a',
+            bids=[DepthLevel(price=49900.0, amount=1.0)],
+            asks=[DepthLevel(price=50000.0, amount=1.0)],
+            timestamp=timestamp
+        ))
+        engine.update_order_book(OrderBook(
+            symbol='BTC/USDT', exchange='exchange_b',
+            bids=[DepthLevel(price=50500.0, amount=1.0)],
+            asks=[DepthLevel(price=50600.0, amount=1.0)],
+            timestamp=timestamp
+        ))
+        
+        with patch('src.engine.fee_manager') as mock_fee_manager:
+            mock_fees = FeesPublic(maker=0.001, taker=0.001, source='default', exchange='test')
+            mock_fee_manager.get_fees = AsyncMock(return_value=mock_fees)
+            
+            opportunities = await engine.scan_opportunities(['BTC/USDT'], ['exchange_a', 'exchange_b'])
+        
+        assert mock_fee_manager.get_fees.await_count == 2
+        assert len(opportunities) == 1
+        assert opportunities[0].buy_exchange == 'exchange_a'
+        assert opportunities[0].buy_fees == (0.001, 0.001)
+
+class TestAlertManager:
+    """Test alert deduplication and queueing."""
+    
+    def test_deduplication_ttl(self):
+        """Test that alerts are deduplicated within the TTL and expire after it."""
+        manager = AlertManager()
+        key = _dedupe_hash('CROSS_a_b_BTC/USDT_100')
+        
+        assert not manager._check_and_mark(key, 100.0)
+        assert manager._check_and_mark(key, 110.0)
+        
+        # Expired entries are evicted from the front of the table and re-marked
+        assert not manager._check_and_mark(key, 100.0 + manager.alert_ttl_seconds)
+        assert manager.sent_alerts[key] == 100.0 + 2 * manager.alert_ttl_seconds
+    
+    def test_bloom_prefilter_rotation(self):
+        """Test that the Bloom prefilter keeps live keys across one rotation only."""
+        manager = AlertManager()
+        ttl = manager.alert_ttl_seconds
+        start = manager._bloom_rotated_at
+        key = _dedupe_hash('TRI_binance_USDT_BTC_ETH')
+        
+        assert not manager._check_and_mark(key, start + 10.0)
+        
+        # Still caught from the previous generation after the filter rotates
+        manager._rotate_bloom(start + ttl)
+        assert not any(manager._bloom)
+        assert manager._check_and_mark(key, start + ttl + 1.0)
+        
+        # Both generations are dropped once the window has fully passed
+        manager._rotate_bloom(start + 3 * ttl)
+        assert not any(manager._bloom) and not any(manager._bloom_prev)
+    
+    def test_cross_exchange_message_format(self):
+        """Test cross-exchange alert message rendering."""
+        opp = Opportunity(
+            symbol='BTC/USDT',
+            buy_exchange='binance',
+            sell_exchange='okx',
+            buy_price_before_fees=50000.0,
+            sell_price_before_fees=50300.0,
+            buy_price_after_fees=50025.0,
+            sell_price_after_fees=50249.7,
+            spread_bps=44.82,
+            notional=100.0,
+            buy_depth_levels=1,
+            sell_depth_levels=2,
+            buy_fees=(0.0002, 0.0005),
+            sell_fees=(0.0008, 0.001),
+            timestamp=datetime(2024, 1, 1, 9, 5, 7),
+            mode='rest'
+        )
+        
+        assert opp.alert_text == (
+            "🔄 [ARB] BTC/USDT binance→okx\n"
+            "💰 Spread: 44.82 bps | Notional: $100\n"
+            "📊 Buy@50025.000000 / Sell@50249.700000\n"
+            "📈 Depth: top2 | Fees: taker | Mode: rest\n"
+            "🕐 09:05:07 UTC"
+        )
+    
+    def test_drain_coalesces_queued_messages(self):
+        """Test that queued alerts are joined into size-limited batches."""
+        manager = AlertManager()
+        for i in range(3):
+            assert manager._enqueue(f"alert {i}")
+        
+        batch = manager._drain("first", max_chars=40)
+        assert batch == "first\n\n---\n\nalert 0\n\n---\n\nalert 1"
+        
+        # The message that did not fit seeds the next batch
+        assert manager._carry_over == "alert 2"
+        assert not manager._pending
+    
+    @pytest.mark.asyncio
+    async def test_burst_sent_in_order_one_batch_per_round(self):
+        """Test that a burst overflowing one message goes out to the chat in order, one batch at a time."""
+        manager = AlertManager()
+        manager.min_send_interval = 0.0
+        sent = []
+        in_flight = 0
+        
+        async def fake_send(message):
+            nonlocal in_flight
+            in_flight += 1
+            assert in_flight == 1
+            await asyncio.sleep(0)
+            in_flight -= 1
+            sent.append(message)
+            return True
+        
+        manager._send_message = fake_send
+        alerts = [f"alert {i:02d} " + "x" * 400 for i in range(30)]
+        for alert in alerts:
+            assert manager._enqueue(alert)
+        
+        while manager._pending or manager._carry_over is not None:
+            await manager._send_round(await manager._next_message())
+        
+        assert len(sent) > 1
+        assert all(len(batch) <= 3900 for batch in sent)
+        assert [part for batch in sent for part in batch.split("\n\n---\n\n")] == alerts
+    
+    @pytest.mark.asyncio
+    async def test_failed_batch_retried_once(self):
+        """Test that a failed batch is re-sent once before later alerts, then dropped."""
+        manager = AlertManager()
+        manager.min_send_interval = 0.0
+        attempts = []
+        
+        async def failing_send(message):
+            attempts.append(message)
+            return False
+        
+        manager._send_message = failing_send
+        manager._enqueue("alert 0")
+        await manager._send_round(await manager._next_message())
+        assert manager._carry_over == "alert 0"
+        
+        await manager._send_round(await manager._next_message())
+        assert attempts == ["alert 0", "alert 0"]
+        assert manager._carry_over is None and not manager._retrying
+    
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending_alerts(self):
+        """Test that stop() waits for queued alerts before cancelling the sender."""
+        manager = AlertManager()
+        sent = []
+        
+        async def fake_send(message):
+            sent.append(message)
+            return True
+        
+        manager._send_message = fake_send
+        manager.send_task = asyncio.create_task(manager._process_send_queue())
+        manager._enqueue("alert 0")
+        manager._enqueue("alert 1")
+        
+        await manager.stop()
+        assert sent == ["alert 0\n\n---\n\nalert 1"]
+        assert manager.send_task.done()
+
+class TestDatabaseMigration:
+    """Test upgrading a database created with datetime text columns."""
+    
+    # Schema written by releases before time columns became epoch microseconds
+    BASELINE_SCHEMA = """
+        CREATE TABLE opportunities (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT NOT NULL, symbol TEXT NOT NULL,
+            buy_exchange TEXT, sell_exchange TEXT, buy_price_before_fees REAL,
+            sell_price_before_fees REAL, buy_price_after_fees REAL, sell_price_after_fees REAL,
+            spread_bps REAL, notional REAL NOT NULL, buy_depth_levels INTEGER,
+            sell_depth_levels INTEGER, buy_fees_maker REAL, buy_fees_taker REAL,
+            sell_fees_maker REAL, sell_fees_taker REAL, mode TEXT,
+            timestamp DATETIME NOT NULL, created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE tri_opportunities (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT NOT NULL, exchange TEXT NOT NULL,
+            base_asset TEXT NOT NULL, path_asset1 TEXT NOT NULL, path_asset2 TEXT NOT NULL,
+            path_asset3 TEXT NOT NULL, start_amount REAL NOT NULL, end_amount REAL NOT NULL,
+            gain_bps REAL NOT NULL, notional REAL NOT NULL, leg1_symbol TEXT NOT NULL,
+            leg1_price REAL NOT NULL, leg1_side TEXT NOT NULL, leg2_symbol TEXT NOT NULL,
+            leg2_price REAL NOT NULL, leg2_side TEXT NOT NULL, leg3_symbol TEXT NOT NULL,
+            leg3_price REAL NOT NULL, leg3_side TEXT NOT NULL, fees_maker REAL NOT NULL,
+            fees_taker REAL NOT NULL, timestamp DATETIME NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE exchange_health (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, exchange TEXT NOT NULL,
+            ws_connected INTEGER NOT NULL, rest_ok INTEGER NOT NULL, last_ws_message DATETIME,
+            last_rest_call DATETIME, reconnect_count INTEGER DEFAULT 0, error_rate REAL DEFAULT 0.0,
+            queue_length INTEGER DEFAULT 0, coalesced_updates INTEGER DEFAULT 0,
+            event_loop_lag_ms REAL DEFAULT 0.0, symbols_subscribed TEXT,
+            timestamp DATETIME NOT NULL, created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO opportunities (type, symbol, notional, timestamp)
+            VALUES ('CROSS', 'BTC/USDT', 100.0, '2024-01-01 12:00:00.123456');
+        INSERT INTO tri_opportunities (
+            type, exchange, base_asset, path_asset1, path_asset2, path_asset3, start_amount,
+            end_amount, gain_bps, notional, leg1_symbol, leg1_price, leg1_side, leg2_symbol,
+            leg2_price, leg2_side, leg3_symbol, leg3_price, leg3_side, fees_maker, fees_taker,
+            timestamp
+        ) VALUES ('TRI', 'binance', 'USDT', 'USDT', 'BTC', 'ETH', 100.0, 100.5, 50.0, 100.0,
+                  'BTC/USDT', 1.0, 'buy', 'ETH/BTC', 1.0, 'buy', 'ETH/USDT', 1.0, 'sell', 0.001, 0.001,
+                  '2024-01-01 12:00:00');
+        INSERT INTO exchange_health (exchange, ws_connected, rest_ok, last_ws_message, last_rest_call, timestamp)
+            VALUES ('binance', 1, 1, '2024-01-01 11:59:59.5', NULL, '2024-01-01 12:00:00.000001');
+    """
+    
+    @pytest.mark.asyncio
+    async def test_migrates_text_timestamps_to_epoch_us(self, tmp_path):
+        """Test that text timestamps become exact epoch microseconds and the version is recorded."""
+        db_path = str(tmp_path / "baseline.db")
+        conn = sqlite3.connect(db_path)
+        conn.executescript(self.BASELINE_SCHEMA)
+        conn.close()
+        
+        noon_us = 1_704_110_400 * 1_000_000  # 2024-01-01 12:00:00 UTC
+        
+        manager = DatabaseManager(db_path)
+        await manager.initialize()
+        try:
+            async with manager._reader() as reader:
+                cursor = await reader.execute("SELECT timestamp FROM opportunities")
+                assert await cursor.fetchall() == [(noon_us + 123456,)]
+                
+                cursor = await reader.execute("SELECT timestamp FROM tri_opportunities")
+                assert await cursor.fetchall() == [(noon_us,)]
+                
+                cursor = await reader.execute(
+                    "SELECT timestamp, last_ws_message, last_rest_call FROM exchange_health"
+                )
+                assert await cursor.fetchall() == [(noon_us + 1, noon_us - 500000, None)]
+                
+                cursor = await reader.execute("PRAGMA user_version")
+                assert await cursor.fetchone() == (SCHEMA_VERSION,)
+        finally:
+            await manager.close()
 
 class TestIntegration:
     """Integration tests with real exchange data."""